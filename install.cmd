@@ -5,6 +5,9 @@ echo Activating virtual environment...
 call venv\Scripts\activate
 echo Installing dependencies...
 pip install -r requirements.txt
+echo Downloading Mermaid library...
+if not exist resources\js mkdir resources\js
+curl -fsSL -o resources\js\mermaid.min.js https://cdn.jsdelivr.net/npm/mermaid@10.2.3/dist/mermaid.min.js || echo Mermaid download failed, the preview will load it from the CDN
 echo Setting up environment...
 echo Please edit the .env file and add your Qianwen API key
 echo Installation complete! Use 'python main.py' to start the application
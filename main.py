@@ -29,6 +29,10 @@ def main():
     
     # 创建并显示主窗口
     window = MainWindow()
+    if not window.is_valid:
+        # 初始化失败时在QApplication仍存在时释放窗口，再退出
+        del window
+        sys.exit(1)
     window.show()
     
     # 运行应用程序事件循环
@@ -5,6 +5,9 @@ echo "正在激活虚拟环境..."
 source venv/bin/activate
 echo "正在安装依赖..."
 pip install -r requirements.txt
+echo "正在下载Mermaid库..."
+mkdir -p resources/js
+curl -fsSL -o resources/js/mermaid.min.js https://cdn.jsdelivr.net/npm/mermaid@10.2.3/dist/mermaid.min.js || echo "Mermaid库下载失败，预览时将从CDN加载"
 echo "正在配置环境..."
 cp .env.example .env
 echo "请编辑.env文件，填入你的阿里千问API密钥"
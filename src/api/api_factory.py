@@ -11,8 +11,6 @@ from typing import Dict, Any, Optional, List
 from dotenv import load_dotenv
 from src.utils.logger import get_logger
 from src.api.base_api import BaseAPIClient
-from src.api.qianwen_api import QianwenAPI
-from src.api.gemini_api import GeminiAPI
 
 # 加载环境变量
 load_dotenv()
@@ -81,10 +79,12 @@ class APIFactory:
         
         logger.info(f"创建API客户端，AI类型: {ai_type}")
         
-        # 根据AI类型创建对应的客户端
+        # 根据AI类型创建对应的客户端，只导入实际使用的客户端模块（Gemini SDK导入较慢）
         if ai_type == APIFactory.AI_TYPE_QIANWEN:
+            from src.api.qianwen_api import QianwenAPI
             return QianwenAPI()
         elif ai_type == APIFactory.AI_TYPE_GEMINI:
+            from src.api.gemini_api import GeminiAPI
             return GeminiAPI()
         else:
             raise ValueError(f"不支持的AI模型类型: {ai_type}")
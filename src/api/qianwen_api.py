@@ -71,7 +71,7 @@ class QianwenAPI(BaseAPIClient):
             prompt = self._create_architecture_prompt(requirements)
             logger.info("调用千问API生成架构设计")
             
-        print(prompt)
+        logger.debug(prompt)
         return self._call_api(prompt, stream_callback)
     
     def _create_architecture_prompt(self, requirements: str) -> str:
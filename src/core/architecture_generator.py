@@ -32,6 +32,18 @@ class ArchitectureGenerator:
             logger.warning("架构验证器模块不可用")
             self.architecture_validator = None
     
+    @property
+    def rule_count(self) -> int:
+        """
+        架构验证使用的规则数量
+        
+        Returns:
+            int: 规则数量，没有架构验证器时为0
+        """
+        if self.architecture_validator is None:
+            return 0
+        return len(self.architecture_validator.rule_validator.rules)
+    
     def generate(self, requirements: str, stream_callback=None) -> Dict[str, Any]:
         """
         生成架构设计
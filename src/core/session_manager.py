@@ -10,7 +10,7 @@ import os
 import json
 import logging
 import time
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
@@ -33,19 +33,22 @@ class Session:
         self.current_architecture = None  # 当前架构设计
         self.name = f"未命名会话 {self.session_id[-8:]}"
     
-    def add_interaction(self, user_input: str, ai_response: Dict[str, Any]) -> None:
+    def add_interaction(self, user_input: str, ai_response: Dict[str, Any], summary: Optional[str] = None) -> None:
         """
         添加一次交互记录
         
         Args:
             user_input: 用户输入
             ai_response: AI响应
+            summary: 架构概述摘要，用于重建聊天历史
         """
         interaction = {
             "timestamp": time.time(),
             "user_input": user_input,
             "ai_response": ai_response
         }
+        if summary is not None:
+            interaction["summary"] = summary
         self.interactions.append(interaction)
         self.updated_at = time.time()
         self.current_architecture = ai_response
@@ -205,33 +208,40 @@ class SessionManager:
         """
         return self.active_session
     
-    def add_interaction(self, user_input: str, ai_response: Dict[str, Any]) -> None:
+    def add_interaction(self, user_input: str, ai_response: Dict[str, Any], summary: Optional[str] = None) -> None:
         """
         添加交互记录到当前活动会话
         
         Args:
             user_input: 用户输入
             ai_response: AI响应
+            summary: 架构概述摘要，用于重建聊天历史
         """
         if self.active_session:
-            self.active_session.add_interaction(user_input, ai_response)
+            self.active_session.add_interaction(user_input, ai_response, summary)
             self._save_session(self.active_session)
             logger.info(f"添加交互记录到会话: {self.active_session.session_id}")
         else:
             logger.warning("没有活动会话，无法添加交互记录")
     
-    def update_last_interaction(self, ai_response: Dict[str, Any]) -> None:
+    def update_last_interaction(self, ai_response: Dict[str, Any], summary: Optional[str] = None,
+                                session_id: Optional[str] = None) -> None:
         """
         更新最后一个交互的响应
         
         Args:
             ai_response: AI响应
-        """
-        if self.active_session and self.active_session.interactions:
-            self.active_session.interactions[-1]["ai_response"] = ai_response
-            self.active_session.current_architecture = ai_response
-            self._save_session(self.active_session)
-            logger.info(f"更新会话 {self.active_session.session_id} 的最后一个交互")
+            summary: 架构概述摘要，用于重建聊天历史
+            session_id: 会话ID，为空时更新当前活动会话
+        """
+        session = self.sessions.get(session_id) if session_id else self.active_session
+        if session and session.interactions:
+            session.interactions[-1]["ai_response"] = ai_response
+            if summary is not None:
+                session.interactions[-1]["summary"] = summary
+            session.current_architecture = ai_response
+            self._save_session(session)
+            logger.info(f"更新会话 {session.session_id} 的最后一个交互")
     
     def rename_session(self, session_id: str, new_name: str) -> bool:
         """
@@ -298,6 +308,15 @@ class SessionManager:
         logger.info(f"删除了所有 {count} 个会话")
         return count
     
+    def iter_sessions(self) -> Iterator[Session]:
+        """
+        遍历所有会话对象（无序，不生成摘要信息）
+        
+        Returns:
+            Iterator[Session]: 会话对象迭代器
+        """
+        return iter(self.sessions.values())
+    
     def get_all_sessions(self) -> List[Dict[str, Any]]:
         """
         获取所有会话的摘要信息
@@ -7,10 +7,13 @@
 """
 
 import os
+import json
+import hashlib
 import tempfile
 import logging
 import shutil
 import subprocess
+import threading
 from typing import Dict, Any, List, Optional
 
 from diagrams import Diagram, Cluster, Edge
@@ -22,10 +25,43 @@ import diagrams.aws.security as security
 import diagrams.aws.integration as integration
 import diagrams.aws.management as management
 
+from src.diagram.system_fonts import get_system_chinese_font
+from src.diagram.dot_process import dot_process
+from src.utils.disk_cache import ensure_cache_dir, get_cache_dir, prune_cache_dir, touch_cache_file
+
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# 已生成架构图的持久缓存目录，相同的图描述在应用重启后也无需重新渲染
+_DIAGRAM_CACHE_DIR = get_cache_dir("diagrams")
+# 缓存目录最多保留的图片数和总大小，超出时淘汰最久未使用的图片
+_DIAGRAM_CACHE_MAX_ENTRIES = 200
+_DIAGRAM_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+def _use_persistent_dot() -> bool:
+    """
+    是否启用常驻dot进程渲染，默认关闭，通过环境变量PERSISTENT_DOT开启
+    
+    Returns:
+        bool: 是否启用
+    """
+    return os.getenv("PERSISTENT_DOT", "False").lower() == "true"
+
+class _PersistentDotDiagram(Diagram):
+    """使用常驻dot进程渲染PNG的Diagram，进程不可用时回退到Diagrams默认渲染"""
+    
+    def render(self) -> None:
+        if self.outformat == "png":
+            png = dot_process.render(self.dot.source)
+            if png is not None:
+                # Diagrams在退出上下文时会删除DOT源文件，这里保持与默认渲染一致
+                self.dot.save()
+                with open(f"{self.filename}.png", "wb") as f:
+                    f.write(png)
+                return
+        super().render()
+
 class DiagramGenerator:
     """架构图生成器"""
     
@@ -34,6 +70,15 @@ class DiagramGenerator:
         # 检查Graphviz是否已安装
         self._check_graphviz()
         
+        # Graphviz字体属性，首次生成图表时计算一次后复用
+        self._graph_attrs = None
+        
+        # Graphviz可用性只需验证一次，避免每次渲染都额外启动dot进程
+        self._graphviz_verified = False
+        
+        # 架构图可能在后台线程中生成，Diagrams的上下文和输出文件不能并发使用
+        self._lock = threading.Lock()
+        
         # AWS服务映射表，将服务类型映射到Diagrams库中的类
         self.service_map = {
             # 计算服务
@@ -98,6 +143,19 @@ class DiagramGenerator:
             logger.warning(f"检查Graphviz时出错: {str(e)}")
     
     def generate_diagram(self, architecture_data: Dict[str, Any]) -> str:
+        """
+        生成架构图，可以在后台线程中调用，多次调用依次执行
+        
+        Args:
+            architecture_data: 架构设计数据
+            
+        Returns:
+            str: 生成的图表文件路径
+        """
+        with self._lock:
+            return self._generate_diagram(architecture_data)
+    
+    def _generate_diagram(self, architecture_data: Dict[str, Any]) -> str:
         """
         生成架构图
         
@@ -125,6 +183,17 @@ class DiagramGenerator:
         
         logger.info(f"生成架构图: {len(nodes_data)}个节点, {len(connections_data)}个连接")
         
+        # 首次生成时确定字体，之后直接复用，避免每次重新检测
+        if self._graph_attrs is None:
+            self._graph_attrs = {"fontname": get_system_chinese_font(), "fontsize": "12"}
+        
+        # 相同的节点、连接和字体生成的图片相同，命中缓存时直接使用缓存的图片
+        cache_path = self._get_cache_path(nodes_data, connections_data)
+        if ensure_cache_dir(_DIAGRAM_CACHE_DIR) and os.path.exists(cache_path):
+            logger.info(f"使用缓存的架构图: {cache_path}")
+            touch_cache_file(cache_path)
+            return cache_path
+        
         # 创建节点字典，用于后续连接
         nodes = {}
         
@@ -133,7 +202,11 @@ class DiagramGenerator:
             self._verify_graphviz()
             
             # 使用Diagrams库生成图表
-            with Diagram("AWS架构图", filename=output_path, show=False):
+            diagram_cls = _PersistentDotDiagram if _use_persistent_dot() else Diagram
+            with diagram_cls("AWS架构图", filename=output_path, show=False,
+                             graph_attr=self._graph_attrs,
+                             node_attr=self._graph_attrs,
+                             edge_attr=self._graph_attrs):
                 # 创建节点
                 for node_data in nodes_data:
                     node_id = node_data.get("id")
@@ -168,14 +241,61 @@ class DiagramGenerator:
             # Diagrams库会自动添加.png扩展名，所以这里不需要再添加
             final_path = output_path + ".png"
             logger.info(f"架构图生成完成: {final_path}")
+            # 优先返回缓存中的文件：缓存文件按内容命名，不会被之后生成的架构图覆盖
+            if self._store_in_cache(final_path, cache_path):
+                return cache_path
             return final_path
         except Exception as e:
             logger.error(f"生成架构图时发生错误: {str(e)}")
             self._handle_graphviz_error(e)
             raise
     
+    def _get_cache_path(self, nodes_data: List[Dict[str, Any]], connections_data: List[Dict[str, Any]]) -> str:
+        """
+        计算架构图在缓存目录中的路径
+        
+        Args:
+            nodes_data: 节点列表
+            connections_data: 连接列表
+            
+        Returns:
+            str: 缓存图片路径
+        """
+        source = json.dumps([nodes_data, connections_data, self._graph_attrs],
+                            sort_keys=True, ensure_ascii=False, default=str)
+        digest = hashlib.blake2b(source.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(_DIAGRAM_CACHE_DIR, digest + ".png")
+    
+    @staticmethod
+    def _store_in_cache(diagram_path: str, cache_path: str) -> bool:
+        """
+        将生成的架构图复制到缓存目录，缓存失败不影响本次生成
+        
+        Args:
+            diagram_path: 生成的图片路径
+            cache_path: 缓存图片路径
+            
+        Returns:
+            bool: 是否缓存成功
+        """
+        if not ensure_cache_dir(_DIAGRAM_CACHE_DIR):
+            return False
+        
+        try:
+            # 先写临时文件再替换，避免其他进程读到不完整的图片
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            shutil.copyfile(diagram_path, tmp_path)
+            os.replace(tmp_path, cache_path)
+            prune_cache_dir(_DIAGRAM_CACHE_DIR, ".png", _DIAGRAM_CACHE_MAX_ENTRIES, _DIAGRAM_CACHE_MAX_BYTES)
+            return True
+        except OSError as e:
+            logger.warning(f"缓存架构图失败: {str(e)}")
+            return False
+    
     def _verify_graphviz(self):
         """验证Graphviz是否可用"""
+        if self._graphviz_verified:
+            return
         try:
             # 尝试运行dot命令
             result = subprocess.run(["dot", "-V"], capture_output=True, text=True)
@@ -183,6 +303,7 @@ class DiagramGenerator:
                 logger.error("Graphviz测试失败")
                 raise RuntimeError("Graphviz不可用，请确保已正确安装")
             logger.info(f"Graphviz版本: {result.stderr.strip()}")
+            self._graphviz_verified = True
         except FileNotFoundError:
             logger.error("未找到Graphviz")
             raise RuntimeError("未找到Graphviz，请安装Graphviz并确保其在系统PATH中")
@@ -0,0 +1,186 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+常驻dot进程模块
+保持一个长期运行的Graphviz dot进程，连续渲染多张图时无需重复启动进程
+"""
+
+import atexit
+import queue
+import shutil
+import struct
+import subprocess
+import threading
+from typing import Optional
+
+from src.utils.logger import get_logger
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# PNG文件签名
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class DotProcess:
+    """常驻的dot渲染进程，从stdin依次读取DOT源码并向stdout输出PNG"""
+
+    def __init__(self, timeout: float = 30.0, first_timeout: float = 3.0):
+        """
+        初始化dot进程包装
+
+        Args:
+            timeout: 单次渲染的超时时间（秒），超时后进程会被终止
+            first_timeout: 首次渲染成功之前的超时时间（秒），尽快发现不支持连续输出的dot
+        """
+        self.timeout = timeout
+        self.first_timeout = first_timeout
+        self._proc = None
+        self._results = None
+        self._lock = threading.Lock()
+        # 是否已有渲染成功，以及出现过读取失败或超时后不再使用常驻进程
+        self._succeeded = False
+        self._disabled = False
+
+    def _ensure_started(self) -> bool:
+        """
+        确保dot进程及其输出读取线程已启动
+
+        Returns:
+            bool: 进程是否可用
+        """
+        if self._proc is not None and self._proc.poll() is None:
+            return True
+
+        dot_path = shutil.which("dot")
+        if not dot_path:
+            return False
+
+        self._proc = subprocess.Popen(
+            [dot_path, "-Tpng"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        # 每个进程只有一个读取线程，依次读取每张图片放入队列
+        self._results = queue.Queue()
+        threading.Thread(target=self._read_loop, args=(self._proc, self._results), daemon=True).start()
+        logger.info(f"已启动常驻dot进程: pid={self._proc.pid}")
+        return True
+
+    def _read_loop(self, proc: subprocess.Popen, results: queue.Queue):
+        """
+        持续读取dot进程输出的PNG图片，进程结束或输出格式错误时放入异常并退出
+
+        Args:
+            proc: dot进程
+            results: 存放读取结果的队列
+        """
+        while True:
+            try:
+                results.put(self._read_png(proc.stdout))
+            except Exception as e:
+                results.put(e)
+                return
+
+    def _read_png(self, stream) -> bytes:
+        """
+        从dot进程的stdout读取一张完整的PNG图片（读到IEND块为止）
+
+        Args:
+            stream: dot进程的stdout
+
+        Returns:
+            bytes: PNG图片数据
+        """
+        data = bytearray(self._read_exact(stream, len(_PNG_SIGNATURE)))
+        if bytes(data) != _PNG_SIGNATURE:
+            raise RuntimeError("dot输出的不是PNG数据")
+
+        while True:
+            header = self._read_exact(stream, 8)
+            length, chunk_type = struct.unpack(">I4s", header)
+            data += header
+            data += self._read_exact(stream, length + 4)  # 数据 + CRC
+            if chunk_type == b"IEND":
+                return bytes(data)
+
+    @staticmethod
+    def _read_exact(stream, size: int) -> bytes:
+        """从流中读取指定字节数"""
+        buf = bytearray()
+        while len(buf) < size:
+            chunk = stream.read(size - len(buf))
+            if not chunk:
+                raise EOFError("dot进程输出意外结束")
+            buf += chunk
+        return bytes(buf)
+
+    def render(self, source: str) -> Optional[bytes]:
+        """
+        渲染DOT源码为PNG
+
+        Args:
+            source: DOT源码
+
+        Returns:
+            Optional[bytes]: PNG图片数据，进程不可用或渲染失败时返回None
+        """
+        with self._lock:
+            if self._disabled:
+                return None
+            try:
+                if not self._ensure_started():
+                    return None
+
+                self._proc.stdin.write(source.encode("utf-8"))
+                self._proc.stdin.write(b"\n")
+                self._proc.stdin.flush()
+
+                # 超时后终止进程而不是永久阻塞
+                timeout = self.timeout if self._succeeded else self.first_timeout
+                try:
+                    png = self._results.get(timeout=timeout)
+                except queue.Empty:
+                    raise TimeoutError(f"dot进程{timeout}秒内没有输出图片")
+                if isinstance(png, Exception):
+                    raise png
+                self._succeeded = True
+                return png
+            except Exception as e:
+                # 输出无法按图片分隔或超时时，之后的渲染也会同样失败，直接停用常驻进程
+                logger.warning(f"常驻dot进程渲染失败，之后将使用普通渲染: {str(e)}")
+                self._disabled = True
+                self._kill()
+                return None
+
+    def _kill(self):
+        """终止dot进程"""
+        if self._proc is not None:
+            try:
+                self._proc.kill()
+                self._proc.wait(timeout=5)
+            except Exception:
+                pass
+            self._proc = None
+            self._results = None
+
+    def close(self):
+        """关闭dot进程"""
+        with self._lock:
+            if self._proc is None:
+                return
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=5)
+            except Exception:
+                self._kill()
+            self._proc = None
+            self._results = None
+            logger.info("常驻dot进程已关闭")
+
+
+# 进程内共享的dot进程，在应用退出时关闭
+dot_process = DotProcess()
+atexit.register(dot_process.close)
@@ -10,15 +10,19 @@ import os
 import sys
 import logging
 import platform
+from functools import lru_cache
 
 # 配置日志
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
 def get_system_chinese_font():
     """
     获取系统中支持中文的字体
     
+    结果在进程内缓存，只在首次调用时检测
+    
     Returns:
         str: 支持中文的字体名称
     """
@@ -7,10 +7,18 @@
 """
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QScrollArea, QFrame, QLabel, 
-                           QSizePolicy, QSpacerItem)
-from PyQt6.QtCore import Qt
+                           QSizePolicy, QSpacerItem, QPushButton)
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QFont
 
+# 聊天消息样式表，设置在聊天容器上，避免每条消息单独解析样式表
+MESSAGE_STYLE_SHEET = """
+QFrame#userMessage { background-color: #e6f7ff; }
+QFrame#systemMessage { background-color: #f0f0f0; }
+QLabel#userSender { font-weight: bold; color: #0066cc; }
+QLabel#systemSender { font-weight: bold; color: #666666; }
+"""
+
 class ChatMessage(QFrame):
     """聊天消息组件"""
     
@@ -25,19 +33,17 @@ class ChatMessage(QFrame):
         """
         super().__init__(parent)
         
-        # 设置样式
+        # 设置样式（样式表由聊天容器统一设置，这里只设置对象名）
         self.setFrameShape(QFrame.Shape.StyledPanel)
         self.setFrameShadow(QFrame.Shadow.Raised)
-        self.setStyleSheet(
-            "background-color: #e6f7ff;" if is_user else "background-color: #f0f0f0;"
-        )
+        self.setObjectName("userMessage" if is_user else "systemMessage")
         
         # 创建布局
         layout = QVBoxLayout(self)
         
         # 创建标签
         sender = QLabel("用户" if is_user else "系统")
-        sender.setStyleSheet("font-weight: bold; color: #0066cc;" if is_user else "font-weight: bold; color: #666666;")
+        sender.setObjectName("userSender" if is_user else "systemSender")
         layout.addWidget(sender)
         
         # 创建消息文本
@@ -46,6 +52,12 @@ class ChatMessage(QFrame):
         message.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
         layout.addWidget(message)
 
+# 思考消息文本，动画在其后追加省略号
+THINKING_TEXT = "正在思考中"
+
+# 加载会话时一次渲染的最大消息数（约50次交互），更早的消息按需加载
+HISTORY_PAGE_SIZE = 100
+
 class ChatHistoryPanel(QWidget):
     """聊天历史面板，用于显示聊天历史记录"""
     
@@ -53,6 +65,18 @@ class ChatHistoryPanel(QWidget):
         """初始化聊天历史面板"""
         super().__init__()
         
+        # 尚未渲染的更早消息
+        self._earlier_messages = []
+        
+        # 当前思考消息组件及其编号
+        self._thinking_message = None
+        self._thinking_id = 0
+        
+        # 思考动画计时器
+        self.thinking_timer = QTimer(self)
+        self.thinking_timer.timeout.connect(self._update_thinking_animation)
+        self.thinking_dots = 0
+        
         # 创建UI组件
         self._create_ui()
     
@@ -62,6 +86,12 @@ class ChatHistoryPanel(QWidget):
         main_layout = QVBoxLayout(self)
         main_layout.setContentsMargins(0, 0, 0, 0)
         
+        # 创建加载更早消息按钮
+        self.load_earlier_button = QPushButton("加载更早的消息")
+        self.load_earlier_button.clicked.connect(self._load_earlier_messages)
+        self.load_earlier_button.hide()
+        main_layout.addWidget(self.load_earlier_button)
+        
         # 创建聊天历史区域
         self.chat_scroll = QScrollArea()
         self.chat_scroll.setWidgetResizable(True)
@@ -69,6 +99,7 @@ class ChatHistoryPanel(QWidget):
         
         # 创建聊天内容容器
         self.chat_container = QWidget()
+        self.chat_container.setStyleSheet(MESSAGE_STYLE_SHEET)
         self.chat_layout = QVBoxLayout(self.chat_container)
         self.chat_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
         self.chat_layout.setSpacing(10)
@@ -128,16 +159,83 @@ class ChatHistoryPanel(QWidget):
         # 滚动到底部
         self.chat_scroll.verticalScrollBar().setValue(self.chat_scroll.verticalScrollBar().maximum())
     
+    def add_messages_bulk(self, messages):
+        """
+        批量添加消息，只移除/添加一次弹性空间并只滚动一次
+        
+        Args:
+            messages: (消息文本, 是否为用户消息) 元组列表
+        """
+        if not messages:
+            return
+        
+        self.chat_container.setUpdatesEnabled(False)
+        try:
+            # 移除弹性空间
+            self.chat_layout.removeItem(self.chat_layout.itemAt(self.chat_layout.count() - 1))
+            
+            # 添加消息
+            for text, is_user in messages:
+                self.chat_layout.addWidget(ChatMessage(text, is_user))
+            
+            # 重新添加弹性空间
+            self.chat_layout.addStretch()
+        finally:
+            self.chat_container.setUpdatesEnabled(True)
+        
+        # 滚动到底部
+        self.chat_scroll.verticalScrollBar().setValue(self.chat_scroll.verticalScrollBar().maximum())
+    
+    def set_history(self, messages):
+        """
+        显示会话历史，只渲染最近的一页消息，更早的消息点击按钮后再加载
+        
+        Args:
+            messages: (消息文本, 是否为用户消息) 元组列表
+        """
+        self._earlier_messages = messages[:-HISTORY_PAGE_SIZE]
+        self.add_messages_bulk(messages[-HISTORY_PAGE_SIZE:])
+        self.load_earlier_button.setVisible(bool(self._earlier_messages))
+    
+    def _load_earlier_messages(self):
+        """在欢迎消息之后插入下一页更早的消息，并保持当前可见位置不变"""
+        if not self._earlier_messages:
+            return
+        
+        chunk = self._earlier_messages[-HISTORY_PAGE_SIZE:]
+        del self._earlier_messages[-HISTORY_PAGE_SIZE:]
+        
+        scroll_bar = self.chat_scroll.verticalScrollBar()
+        old_value = scroll_bar.value()
+        old_maximum = scroll_bar.maximum()
+        
+        self.chat_container.setUpdatesEnabled(False)
+        try:
+            # 索引0为欢迎消息
+            for offset, (text, is_user) in enumerate(chunk):
+                self.chat_layout.insertWidget(1 + offset, ChatMessage(text, is_user))
+        finally:
+            self.chat_container.setUpdatesEnabled(True)
+        
+        self.load_earlier_button.setVisible(bool(self._earlier_messages))
+        
+        # 布局更新后滚动范围才会变化，延迟恢复滚动位置
+        QTimer.singleShot(0, lambda: scroll_bar.setValue(
+            old_value + scroll_bar.maximum() - old_maximum
+        ))
+    
     def add_thinking_message(self):
         """
         添加思考中消息
         
         Returns:
-            int: 消息索引
+            int: 思考消息编号，更新消息时用于确认仍是同一条思考消息
         """
+        # 停止上一条思考消息的动画
+        self.thinking_timer.stop()
+        
         # 创建带有动画效果的思考消息
-        thinking_text = "正在思考中"
-        message = ChatMessage(thinking_text + "...", False)
+        message = ChatMessage(THINKING_TEXT + "...", False)
         
         # 移除弹性空间
         self.chat_layout.removeItem(self.chat_layout.itemAt(self.chat_layout.count() - 1))
@@ -151,54 +249,68 @@ class ChatHistoryPanel(QWidget):
         # 滚动到底部
         self.chat_scroll.verticalScrollBar().setValue(self.chat_scroll.verticalScrollBar().maximum())
         
+        # 记录思考消息组件，布局中的索引会随插入更早消息而变化
+        self._thinking_id += 1
+        self._thinking_message = message
+        
         # 启动动画计时器
-        from PyQt6.QtCore import QTimer
-        self.thinking_timer = QTimer()
-        self.thinking_timer.timeout.connect(lambda: self._update_thinking_animation(message, thinking_text))
         self.thinking_dots = 0
         self.thinking_timer.start(500)  # 每500毫秒更新一次
         
-        return self.chat_layout.count() - 2  # 返回消息索引（减去弹性空间）
+        return self._thinking_id
     
-    def _update_thinking_animation(self, message_widget, base_text):
+    def _update_thinking_animation(self):
         """更新思考动画"""
+        if self._thinking_message is None:
+            self.thinking_timer.stop()
+            return
+        
         self.thinking_dots = (self.thinking_dots + 1) % 4
-        dots = "." * self.thinking_dots
         # 找到消息文本标签（第二个子部件）
-        for i in range(message_widget.layout().count()):
-            item = message_widget.layout().itemAt(i)
-            if item and isinstance(item.widget(), QLabel) and i == 1:
-                item.widget().setText(base_text + "." * self.thinking_dots + " " * (3 - self.thinking_dots))
+        item = self._thinking_message.layout().itemAt(1)
+        if item and isinstance(item.widget(), QLabel):
+            item.widget().setText(THINKING_TEXT + "." * self.thinking_dots + " " * (3 - self.thinking_dots))
     
-    def update_thinking_message(self, index, text):
+    def update_thinking_message(self, thinking_id, text):
         """
-        更新思考中消息
+        更新思考中消息，思考消息已被清空或替换时忽略
         
         Args:
-            index: 消息索引
+            thinking_id: add_thinking_message返回的思考消息编号
             text: 新消息文本
         """
-        # 获取消息组件
-        item = self.chat_layout.itemAt(index)
-        if item and item.widget():
-            # 停止思考动画计时器
-            if hasattr(self, 'thinking_timer') and self.thinking_timer.isActive():
-                self.thinking_timer.stop()
-            
-            # 移除旧消息
-            old_message = item.widget()
-            self.chat_layout.removeWidget(old_message)
-            old_message.deleteLater()
-            
-            # 添加新消息
-            message = ChatMessage(text, False)
-            self.chat_layout.insertWidget(index, message)
-            
-            # 滚动到底部
-            self.chat_scroll.verticalScrollBar().setValue(self.chat_scroll.verticalScrollBar().maximum())
+        if thinking_id != self._thinking_id or self._thinking_message is None:
+            return
+        
+        # 停止思考动画计时器
+        self.thinking_timer.stop()
+        
+        old_message = self._thinking_message
+        self._thinking_message = None
+        index = self.chat_layout.indexOf(old_message)
+        if index < 0:
+            return
+        
+        # 移除旧消息
+        self.chat_layout.removeWidget(old_message)
+        old_message.deleteLater()
+        
+        # 添加新消息
+        message = ChatMessage(text, False)
+        self.chat_layout.insertWidget(index, message)
+        
+        # 滚动到底部
+        self.chat_scroll.verticalScrollBar().setValue(self.chat_scroll.verticalScrollBar().maximum())
     
     def clear(self):
         """清空聊天历史"""
+        self._earlier_messages = []
+        
+        # 停止思考动画，尚未返回的请求不再更新已清空的思考消息
+        self.thinking_timer.stop()
+        self._thinking_message = None
+        self.load_earlier_button.hide()
+        
         # 移除所有消息
         while self.chat_layout.count() > 1:  # 保留弹性空间
             item = self.chat_layout.itemAt(0)
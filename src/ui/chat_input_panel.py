@@ -64,6 +64,10 @@ class ChatInputPanel(QWidget):
         button_layout.addWidget(self.send_button)
         
         main_layout.addLayout(button_layout)
+        
+        # 缓存需要随处理状态启用/禁用的输入控件
+        self._inputs = (self.input_edit, self.send_button, self.template_combo)
+        self._enabled = True
     
     def _send_message(self):
         """发送消息"""
@@ -85,9 +89,17 @@ class ChatInputPanel(QWidget):
         Args:
             enabled: 是否可用
         """
-        self.input_edit.setEnabled(enabled)
-        self.send_button.setEnabled(enabled)
-        self.template_combo.setEnabled(enabled)
+        if enabled == self._enabled:
+            return
+        self._enabled = enabled
+        
+        # 暂停重绘，使禁用状态的样式变化只绘制一次
+        self.setUpdatesEnabled(False)
+        try:
+            for widget in self._inputs:
+                widget.setEnabled(enabled)
+        finally:
+            self.setUpdatesEnabled(True)
     
     def _load_template(self, index):
         """加载需求模板"""
@@ -74,19 +74,19 @@ class ChatPanel(QWidget):
         添加思考中消息
         
         Returns:
-            int: 消息索引
+            int: 思考消息编号
         """
         return self.history_panel.add_thinking_message()
     
-    def update_thinking_message(self, index, text):
+    def update_thinking_message(self, thinking_id, text):
         """
         更新思考中消息
         
         Args:
-            index: 消息索引
+            thinking_id: 思考消息编号
             text: 新消息文本
         """
-        self.history_panel.update_thinking_message(index, text)
+        self.history_panel.update_thinking_message(thinking_id, text)
     
     def set_enabled(self, enabled):
         """
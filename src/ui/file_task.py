@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+后台文件任务模块
+在线程池中执行文件写入，避免磁盘操作阻塞界面
+"""
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.utils.logger import get_logger
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+class FileTaskSignals(QObject):
+    """文件写入任务的信号"""
+    
+    # 成功信号：状态栏消息
+    succeeded = pyqtSignal(str)
+    # 失败信号：对话框标题、错误信息
+    failed = pyqtSignal(str, str)
+
+class FileTask(QRunnable):
+    """在线程池中执行的文件写入任务，避免磁盘写入阻塞界面"""
+    
+    def __init__(self, write, success_message, error_title, error_prefix):
+        """
+        初始化文件写入任务
+        
+        Args:
+            write: 执行写入的无参函数，不能访问界面控件
+            success_message: 成功后显示的状态栏消息
+            error_title: 失败时的对话框标题
+            error_prefix: 失败时的错误信息前缀
+        """
+        super().__init__()
+        self.write = write
+        self.success_message = success_message
+        self.error_title = error_title
+        self.error_prefix = error_prefix
+        self.signals = FileTaskSignals()
+    
+    def run(self):
+        """执行写入"""
+        try:
+            self.write()
+            self.signals.succeeded.emit(self.success_message)
+        except Exception as e:
+            logger.error(f"{self.error_prefix}: {str(e)}")
+            self.signals.failed.emit(self.error_title, f"{self.error_prefix}: {str(e)}")
\ No newline at end of file
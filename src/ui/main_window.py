@@ -9,24 +9,133 @@
 import os
 import sys
 import logging
+import threading
+from collections import deque
+from functools import partial
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                            QSplitter, QMessageBox, QStatusBar, QToolBar, 
-                           QFileDialog, QTabWidget, QPushButton, QLabel, QTextEdit)
-from PyQt6.QtCore import Qt, QSize, QMetaObject, Q_ARG
+                           QFileDialog, QTabWidget, QPushButton, QLabel, QTextEdit,
+                           QApplication)
+from PyQt6.QtCore import (Qt, QSize, QMetaObject, Q_ARG, QObject, QThread,
+                          QThreadPool, QTimer, pyqtSignal, pyqtSlot)
 from PyQt6.QtGui import QAction, QIcon, QFont
 
 from src.ui.chat_panel import ChatPanel
 from src.ui.output_panel import OutputPanel
 from src.ui.session_panel import SessionPanel
 from src.ui.model_config_dialog import ModelConfigDialog
+from src.ui.file_task import FileTask
+from src.ui.throttle import qthrottled
 from src.api.api_factory import APIFactory
 from src.core.session_manager import SessionManager
-from src.core.architecture_generator import ArchitectureGenerator
 from src.utils.logger import get_logger
 
 # 获取日志记录器
 logger = get_logger(__name__)
 
+# 架构调整提示模板片段，依次在片段之间插入历史交互、当前架构概述和新的调整需求
+_ADJUSTMENT_TEMPLATE = (
+    "基于以下历史交互和当前架构，根据新的需求调整架构设计：\n\n历史交互：\n",
+    "\n\n当前架构概述：\n",
+    "\n\n新的调整需求：\n",
+    "\n\n请保持原有架构的基本结构，根据新需求进行必要的调整。\n",
+)
+
+# 关闭窗口时等待API请求结束期间处理事件的间隔（毫秒）
+_API_THREAD_POLL_INTERVAL = 50
+
+def _summarize(text: str, limit: int = 200) -> str:
+    """
+    截取架构概述摘要
+    
+    Args:
+        text: 架构概述
+        limit: 最大字符数
+        
+    Returns:
+        str: 超过长度时截断并追加省略号的摘要
+    """
+    return f"{text[:limit]}..." if len(text) > limit else text
+
+class ApiWorker(QObject):
+    """API调用工作对象，运行在常驻的后台线程中"""
+    
+    # 请求信号：需求、是否为调整、会话、当前架构、思考消息编号、会话ID
+    request = pyqtSignal(str, bool, object, object, int, str)
+    # 结果信号：响应、需求、思考消息编号、会话ID
+    result_ready = pyqtSignal(dict, str, int, str)
+    # 错误信号：错误信息、思考消息编号、会话ID
+    error_occurred = pyqtSignal(str, int, str)
+    
+    def __init__(self, architecture_generator):
+        """
+        初始化API工作对象
+        
+        Args:
+            architecture_generator: 架构生成器
+        """
+        super().__init__()
+        self.architecture_generator = architecture_generator
+        self.request.connect(self.do_request)
+    
+    @pyqtSlot(str, bool, object, object, int, str)
+    def do_request(self, requirements, is_adjustment, session, current_architecture, thinking_id, session_id):
+        """
+        执行API调用
+        
+        Args:
+            requirements: 用户需求
+            is_adjustment: 是否为架构调整
+            session: 发起请求的会话，请求处理期间界面不会再向其添加交互
+            current_architecture: 当前架构
+            thinking_id: 思考消息编号
+            session_id: 发起请求的会话ID
+        """
+        try:
+            if is_adjustment:
+                # 在工作线程中构建历史交互上下文和调整提示
+                adjustment_prompt = "".join((
+                    _ADJUSTMENT_TEMPLATE[0], session.get_context_for_next_interaction(),
+                    _ADJUSTMENT_TEMPLATE[1], current_architecture.get('architecture_overview', '无架构概述'),
+                    _ADJUSTMENT_TEMPLATE[2], requirements,
+                    _ADJUSTMENT_TEMPLATE[3]
+                ))
+                # 使用架构生成器生成架构，它会自动验证规则
+                response = self.architecture_generator.generate(adjustment_prompt)
+            else:
+                # 使用架构生成器生成架构，它会自动验证规则
+                response = self.architecture_generator.generate(requirements)
+            
+            self.result_ready.emit(response, requirements, thinking_id, session_id)
+        except Exception as e:
+            self.error_occurred.emit(str(e), thinking_id, session_id)
+
+def _write_text_file(file_path, content):
+    """
+    写入文本文件
+    
+    Args:
+        file_path: 文件路径
+        content: 文件内容，字节内容直接以二进制写入
+    """
+    if isinstance(content, bytes):
+        with open(file_path, "wb", buffering=1024 * 1024) as f:
+            f.write(content)
+        return
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+def _save_image_file(file_path, image):
+    """
+    保存图像文件
+    
+    Args:
+        file_path: 文件路径
+        image: QImage图像
+    """
+    if not image.save(file_path, quality=100):  # 使用最高质量设置
+        raise IOError(f"无法写入图像文件 {file_path}")
+
 class MainWindow(QMainWindow):
     """应用程序主窗口"""
     
@@ -44,21 +153,34 @@ class MainWindow(QMainWindow):
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
         
+        # 初始化是否成功，失败时由调用方在进入事件循环前退出
+        self.is_valid = False
+        
         # 初始化会话管理器
         self.session_manager = SessionManager()
         
         # 初始化API客户端
         try:
-            # 初始化架构生成器（内部会创建API客户端）
+            # 初始化架构生成器（内部会创建API客户端），在此处导入以免导入本模块时加载API客户端
+            from src.core.architecture_generator import ArchitectureGenerator
             self.architecture_generator = ArchitectureGenerator()
+            # 规则在验证器初始化时加载，之后不再变化
+            self._rule_count = self.architecture_generator.rule_count
             # 获取API客户端引用
             self.api_client = self.architecture_generator.api_client
             # 保存API工厂引用
-            from src.api.api_factory import APIFactory
             self.api_factory = APIFactory
         except ValueError as e:
             QMessageBox.critical(self, "API配置错误", str(e))
-            sys.exit(1)
+            return
+        
+        # 创建常驻的API工作线程，所有消息复用同一个线程
+        self._api_thread = QThread(self)
+        self._api_worker = ApiWorker(self.architecture_generator)
+        self._api_worker.moveToThread(self._api_thread)
+        # 线程结束时在其所属线程中释放工作对象
+        self._api_thread.finished.connect(self._api_worker.deleteLater)
+        self._api_thread.start()
         
         # 创建UI组件
         self._create_ui()
@@ -66,16 +188,25 @@ class MainWindow(QMainWindow):
         self._create_statusbar()
         self._create_connections()
         
-        # 清理没有交互的会话
-        self._cleanup_empty_sessions()
-        
         # 如果没有活动会话，创建一个新会话
         if not self.session_manager.get_active_session():
             self.session_manager.create_session()
             self.session_panel.refresh()
+        
+        # 清理没有交互的会话，推迟到窗口首次绘制之后执行
+        QTimer.singleShot(0, partial(self._cleanup_empty_sessions, refresh=True))
             
+        # 窗口大小变化和分割器拖动时合并处理，避免每个像素都重新设置分割比例
+        self._resize_pending = False
+        self._splitter_timer = QTimer(self)
+        self._splitter_timer.setSingleShot(True)
+        self._splitter_timer.setInterval(16)
+        self._splitter_timer.timeout.connect(self._apply_splitter_constraints)
+        
         # 设置窗口大小变化事件
         self.resizeEvent = self._on_resize
+        
+        self.is_valid = True
     
     def _create_ui(self):
         """创建UI组件"""
@@ -113,8 +244,11 @@ class MainWindow(QMainWindow):
         self.output_panel = OutputPanel()
         splitter.addWidget(self.output_panel)
         
-        # 设置分割器比例
-        splitter.setSizes([300, 900])
+        # 设置分割器比例（聊天:输出 = 1:3），由布局在显示时一次性计算
+        splitter.setStretchFactor(0, 1)
+        splitter.setStretchFactor(1, 3)
+        splitter.setChildrenCollapsible(False)  # 防止完全折叠
+        splitter.setOpaqueResize(False)  # 拖动时只移动分割条，松开后再重新布局
         
         # 将分割器添加到工作区布局
         work_layout.addWidget(splitter)
@@ -169,45 +303,30 @@ class MainWindow(QMainWindow):
         toolbar.setIconSize(QSize(16, 16))
         self.addToolBar(toolbar)
         
-        # 保存架构按钮
-        save_action = QAction("保存架构", self)
-        save_action.setStatusTip("保存架构设计到文件")
-        save_action.triggered.connect(self._save_architecture)
-        toolbar.addAction(save_action)
-        
-        # 导出图表按钮
-        export_diagram_action = QAction("导出图表", self)
-        export_diagram_action.setStatusTip("导出架构图")
-        export_diagram_action.triggered.connect(self._export_diagram)
-        toolbar.addAction(export_diagram_action)
-        
-        # 导出Mermaid图表按钮
-        export_mermaid_action = QAction("导出Mermaid", self)
-        export_mermaid_action.setStatusTip("导出Mermaid格式的架构图")
-        export_mermaid_action.triggered.connect(self._export_mermaid)
-        toolbar.addAction(export_mermaid_action)
-        
-        toolbar.addSeparator()
-        
-        # 新建会话按钮
-        new_session_action = QAction("新建会话", self)
-        new_session_action.setStatusTip("创建新的架构设计会话")
-        new_session_action.triggered.connect(self._create_new_session)
-        toolbar.addAction(new_session_action)
-        
-        # 清理所有会话按钮
-        clear_all_sessions_action = QAction("清理所有会话", self)
-        clear_all_sessions_action.setStatusTip("删除所有会话")
-        clear_all_sessions_action.triggered.connect(self._clear_all_sessions)
-        toolbar.addAction(clear_all_sessions_action)
-        
-        toolbar.addSeparator()
-        
-        # AI模型配置按钮
-        model_config_action = QAction("AI模型配置", self)
-        model_config_action.setStatusTip("配置AI模型参数")
-        model_config_action.triggered.connect(self._show_model_config_dialog)
-        toolbar.addAction(model_config_action)
+        # 按钮分组：(文本, 状态栏提示, 处理函数)，组之间以分隔符隔开
+        action_groups = (
+            (
+                ("保存架构", "保存架构设计到文件", self._save_architecture),
+                ("导出图表", "导出架构图", self._export_diagram),
+                ("导出Mermaid", "导出Mermaid格式的架构图", self._export_mermaid),
+            ),
+            (
+                ("新建会话", "创建新的架构设计会话", self._create_new_session),
+                ("清理所有会话", "删除所有会话", self._clear_all_sessions),
+            ),
+            (
+                ("AI模型配置", "配置AI模型参数", self._show_model_config_dialog),
+            ),
+        )
+        
+        for group_index, actions in enumerate(action_groups):
+            if group_index:
+                toolbar.addSeparator()
+            for text, status_tip, slot in actions:
+                action = QAction(text, self)
+                action.setStatusTip(status_tip)
+                action.triggered.connect(slot)
+                toolbar.addAction(action)
     
     def _create_statusbar(self):
         """创建状态栏"""
@@ -227,6 +346,14 @@ class MainWindow(QMainWindow):
         self.session_panel.session_selected.connect(self._on_session_selected)
         self.session_panel.session_created.connect(self._on_session_created)
         
+        # 状态栏和思考消息的更新做节流，合并高频更新为一次重绘
+        self._set_status = qthrottled(self.statusBar.showMessage, timeout=30)
+        self._update_thinking = qthrottled(self.chat_panel.update_thinking_message, timeout=30)
+        
+        # API工作线程
+        self._api_worker.result_ready.connect(self._handle_api_response)
+        self._api_worker.error_occurred.connect(self._handle_api_error)
+        
     def _show_model_config_dialog(self):
         """显示AI模型配置对话框"""
         dialog = ModelConfigDialog(self)
@@ -257,9 +384,6 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "模型切换错误", f"切换AI模型时发生错误: {str(e)}")
             logger.error(f"切换AI模型失败: {str(e)}")
     
-    # 保存线程引用，防止线程被垃圾回收
-    api_threads = []
-    
     def _process_message(self, message):
         """
         处理用户消息
@@ -276,16 +400,18 @@ class MainWindow(QMainWindow):
             return
         
         # 更新状态
-        self.statusBar.showMessage("正在处理...")
+        self._set_status("正在处理...")
         
         # 添加思考中消息
-        thinking_index = self.chat_panel.add_thinking_message()
+        thinking_id = self.chat_panel.add_thinking_message()
         
         # 禁用输入面板
         self.chat_panel.set_enabled(False)
         
         # 检查是否是第一次交互
         is_first_interaction = len(active_session.interactions) == 0
+        # 添加临时响应前记录当前架构，否则会被临时响应替换
+        current_architecture = active_session.current_architecture
         
         # 立即保存用户输入到会话
         # 创建一个临时的响应对象，后续会更新
@@ -294,115 +420,94 @@ class MainWindow(QMainWindow):
         # 刷新会话面板，显示最新会话状态
         self.session_panel.refresh()
         
-        # 使用QThread处理API调用
-        from PyQt6.QtCore import QThread, pyqtSignal
-        
-        class ApiThread(QThread):
-            result_ready = pyqtSignal(dict)
-            error_occurred = pyqtSignal(str)
-            
-            def __init__(self, architecture_generator, requirements, is_adjustment=False, context="", current_architecture=None):
-                super().__init__()
-                self.architecture_generator = architecture_generator
-                self.requirements = requirements
-                self.is_adjustment = is_adjustment
-                self.context = context
-                self.current_architecture = current_architecture
-            
-            def run(self):
-                try:
-                    if self.is_adjustment:
-                        # 构建调整提示
-                        adjustment_prompt = f"""基于以下历史交互和当前架构，根据新的需求调整架构设计：
-
-历史交互：
-{self.context}
-
-当前架构概述：
-{self.current_architecture.get('architecture_overview', '无架构概述')}
-
-新的调整需求：
-{self.requirements}
-
-请保持原有架构的基本结构，根据新需求进行必要的调整。
-"""
-                        # 使用架构生成器生成架构，它会自动验证规则
-                        response = self.architecture_generator.generate(adjustment_prompt)
-                    else:
-                        # 使用架构生成器生成架构，它会自动验证规则
-                        response = self.architecture_generator.generate(self.requirements)
-                    
-                    self.result_ready.emit(response)
-                except Exception as e:
-                    self.error_occurred.emit(str(e))
-        
-        # 创建线程
-        thread = ApiThread(
-            self.architecture_generator, 
+        # 交给常驻工作线程处理API调用
+        self._api_worker.request.emit(
             message,
-            is_adjustment=not is_first_interaction,
-            context=active_session.get_context_for_next_interaction() if not is_first_interaction else "",
-            current_architecture=active_session.current_architecture if not is_first_interaction else None
+            not is_first_interaction,
+            active_session,
+            current_architecture if not is_first_interaction else None,
+            thinking_id,
+            active_session.session_id
         )
-        
-        # 保存线程引用，防止被垃圾回收
-        MainWindow.api_threads.append(thread)
-        
-        # 添加线程完成后的清理
-        thread.finished.connect(lambda: MainWindow.api_threads.remove(thread) if thread in MainWindow.api_threads else None)
-        
-        # 连接信号
-        thread.result_ready.connect(
-            lambda response: self._handle_api_response(response, message, thinking_index)
-        )
-        thread.error_occurred.connect(
-            lambda error: self._handle_api_error(error, thinking_index)
-        )
-        
-        # 启动线程
-        thread.start()
     
-    def _handle_api_response(self, response, requirements, thinking_index):
+    @pyqtSlot(dict, str, int, str)
+    def _handle_api_response(self, response, requirements, thinking_id, session_id):
         """处理API响应"""
         if "error" in response:
-            self._handle_api_error(response["error"], thinking_index)
+            self._handle_api_error(response["error"], thinking_id, session_id)
             return
         
+        # 响应记录到发起请求的会话，即使期间用户切换了会话
+        active_session = self.session_manager.get_active_session()
+        is_active = active_session is not None and active_session.session_id == session_id
+        
         # 更新思考中消息为成功消息
-        overview = response.get("architecture_overview", "")
-        summary = overview[:200] + "..." if len(overview) > 200 else overview
+        overview = response.get("architecture_overview") or ""
+        summary = _summarize(overview) if overview else "(无概述)"
         
         # 检查是否有规则验证信息
-        validation_info = ""
-        if hasattr(self.architecture_generator, "architecture_validator"):
-            validator = self.architecture_generator.architecture_validator
-            if hasattr(validator, "rule_validator") and validator.rule_validator.rules:
-                validation_info = f"\n\n架构已通过AI验证，符合 {len(validator.rule_validator.rules)} 条架构规则"
+        validation_info = f"\n\n架构已通过AI验证，符合 {self._rule_count} 条架构规则" if self._rule_count else ""
         
-        self.chat_panel.update_thinking_message(thinking_index, f"架构设计已生成:{validation_info}\n\n{summary}")
+        if is_active:
+            self._update_thinking(thinking_id, f"架构设计已生成:{validation_info}\n\n{summary}")
+            
+            # 显示结果
+            self.output_panel.display_architecture(response)
+        self._set_status("架构设计生成完成")
         
-        # 显示结果
-        self.output_panel.display_architecture(response)
-        self.statusBar.showMessage("架构设计生成完成")
+        # 更新最后一个交互的响应
+        self.session_manager.update_last_interaction(response, summary=summary, session_id=session_id)
+        self.session_panel.refresh()
         
-        # 更新会话中的响应
+        # 启用输入面板，延迟到下一次事件循环，与待处理的重绘合并
+        QTimer.singleShot(0, partial(self.chat_panel.set_enabled, True))
+    
+    @pyqtSlot(str, int, str)
+    def _handle_api_error(self, error, thinking_id, session_id):
+        """处理API错误"""
+        # 更新思考中消息为错误消息（用户已切换会话时思考消息已不存在）
         active_session = self.session_manager.get_active_session()
-        if active_session:
-            # 更新最后一个交互的响应
-            self.session_manager.update_last_interaction(response)
-            self.session_panel.refresh()
+        if active_session is not None and active_session.session_id == session_id:
+            self._update_thinking(thinking_id, f"处理失败: {error}")
+        self._set_status("处理失败")
         
-        # 启用输入面板
-        self.chat_panel.set_enabled(True)
+        # 启用输入面板，延迟到下一次事件循环，与待处理的重绘合并
+        QTimer.singleShot(0, partial(self.chat_panel.set_enabled, True))
     
-    def _handle_api_error(self, error, thinking_index):
-        """处理API错误"""
-        # 更新思考中消息为错误消息
-        self.chat_panel.update_thinking_message(thinking_index, f"处理失败: {error}")
-        self.statusBar.showMessage("处理失败")
+    def _open_save_dialog(self, caption, name_filter, on_selected):
+        """
+        打开非模态的保存文件对话框
         
-        # 启用输入面板
-        self.chat_panel.set_enabled(True)
+        Args:
+            caption: 对话框标题
+            name_filter: 文件类型过滤器
+            on_selected: 选中文件后的回调，参数为文件路径
+        """
+        dialog = QFileDialog(self, caption, "", name_filter)
+        dialog.setAcceptMode(QFileDialog.AcceptMode.AcceptSave)
+        dialog.setFileMode(QFileDialog.FileMode.AnyFile)
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        dialog.fileSelected.connect(on_selected)
+        dialog.open()
+    
+    def _start_file_task(self, write, success_message, error_title, error_prefix):
+        """
+        在线程池中执行文件写入
+        
+        Args:
+            write: 执行写入的无参函数
+            success_message: 成功后显示的状态栏消息
+            error_title: 失败时的对话框标题
+            error_prefix: 失败时的错误信息前缀
+        """
+        task = FileTask(write, success_message, error_title, error_prefix)
+        task.signals.succeeded.connect(self.statusBar.showMessage)
+        task.signals.failed.connect(self._on_file_task_failed)
+        QThreadPool.globalInstance().start(task)
+    
+    def _on_file_task_failed(self, title, message):
+        """文件写入失败"""
+        QMessageBox.critical(self, title, message)
     
     def _save_architecture(self):
         """保存架构设计到文件"""
@@ -410,16 +515,26 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "保存错误", "没有可保存的架构设计")
             return
         
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "保存架构设计", "", "Markdown文件 (*.md);;JSON文件 (*.json);;Mermaid文件 (*.mmd);;所有文件 (*)"
+        self._open_save_dialog(
+            "保存架构设计", "Markdown文件 (*.md);;JSON文件 (*.json);;Mermaid文件 (*.mmd);;所有文件 (*)",
+            self._do_save_architecture
         )
+    
+    def _do_save_architecture(self, file_path):
+        """生成文件内容后在后台写入架构设计"""
+        if not file_path:
+            return
         
-        if file_path:
-            try:
-                self.output_panel.save_architecture(file_path)
-                self.statusBar.showMessage(f"架构设计已保存到 {file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "保存错误", f"保存文件时发生错误: {str(e)}")
+        try:
+            content = self.output_panel.get_architecture_file_content(file_path)
+        except Exception as e:
+            QMessageBox.critical(self, "保存错误", f"保存文件时发生错误: {str(e)}")
+            return
+        
+        self._start_file_task(
+            partial(_write_text_file, file_path, content),
+            f"架构设计已保存到 {file_path}", "保存错误", "保存文件时发生错误"
+        )
     
     def _export_diagram(self):
         """导出架构图"""
@@ -427,32 +542,49 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "导出错误", "没有可导出的架构图")
             return
         
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "导出架构图", "", "PNG图片 (*.png);;SVG图片 (*.svg);;所有文件 (*)"
+        self._open_save_dialog(
+            "导出架构图", "PNG图片 (*.png);;SVG图片 (*.svg);;所有文件 (*)",
+            self._do_export_diagram
         )
+    
+    def _do_export_diagram(self, file_path):
+        """在后台保存架构图"""
+        if not file_path:
+            return
+        
+        try:
+            if file_path.lower().endswith('.mmd'):
+                write = partial(_write_text_file, file_path, self.output_panel.mermaid_editor.toPlainText())
+            else:
+                write = partial(_save_image_file, file_path, self.output_panel.get_diagram_export_image())
+        except Exception as e:
+            QMessageBox.critical(self, "导出错误", f"导出图表时发生错误: {str(e)}")
+            return
         
-        if file_path:
-            try:
-                self.output_panel.export_diagram(file_path)
-                self.statusBar.showMessage(f"架构图已导出到 {file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "导出错误", f"导出图表时发生错误: {str(e)}")
+        self._start_file_task(
+            write, f"架构图已导出到 {file_path}", "导出错误", "导出图表时发生错误"
+        )
     
     def _export_mermaid(self):
         """导出Mermaid格式的架构图"""
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "导出Mermaid图表", "", "Mermaid文件 (*.mmd);;所有文件 (*)"
+        self._open_save_dialog(
+            "导出Mermaid图表", "Mermaid文件 (*.mmd);;所有文件 (*)",
+            self._do_export_mermaid
         )
+    
+    def _do_export_mermaid(self, file_path):
+        """在后台保存Mermaid图表"""
+        if not file_path:
+            return
+        
+        # 确保文件扩展名为.mmd
+        if not file_path.lower().endswith('.mmd'):
+            file_path += '.mmd'
         
-        if file_path:
-            try:
-                # 确保文件扩展名为.mmd
-                if not file_path.lower().endswith('.mmd'):
-                    file_path += '.mmd'
-                self.output_panel.export_diagram(file_path)
-                self.statusBar.showMessage(f"Mermaid图表已导出到 {file_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "导出错误", f"导出Mermaid图表时发生错误: {str(e)}")
+        self._start_file_task(
+            partial(_write_text_file, file_path, self.output_panel.mermaid_editor.toPlainText()),
+            f"Mermaid图表已导出到 {file_path}", "导出错误", "导出Mermaid图表时发生错误"
+        )
     
     def _create_new_session(self):
         """创建新会话"""
@@ -469,13 +601,7 @@ class MainWindow(QMainWindow):
         self.chat_panel.clear()
         
         # 清空输出面板
-        self.output_panel.overview_tab.clear()
-        self.output_panel.components_tab.clear()
-        self.output_panel.decisions_tab.clear()
-        self.output_panel.practices_tab.clear()
-        self.output_panel.json_tab.clear()
-        self.output_panel.diagram_image_label.setText("尚未生成架构图")
-        self.output_panel.clear_mermaid()
+        self.output_panel.reset()
         
         self.statusBar.showMessage("已创建新会话")
     
@@ -491,60 +617,67 @@ class MainWindow(QMainWindow):
         if not session:
             return
         
-        # 清空聊天面板
-        self.chat_panel.clear()
-        
-        # 重建聊天历史
-        if session.interactions:
-            for interaction in session.interactions:
-                # 添加用户消息
-                self.chat_panel.history_panel.add_user_message(interaction["user_input"])
-                
-                # 添加系统响应
-                if "architecture_overview" in interaction["ai_response"]:
-                    overview = interaction["ai_response"]["architecture_overview"]
-                    summary = overview[:200] + "..." if len(overview) > 200 else overview
-                    self.chat_panel.history_panel.add_system_message(f"架构设计已生成/调整:\n\n{summary}")
+        # 收集聊天历史
+        messages = []
+        for interaction in session.interactions:
+            # 添加用户消息
+            messages.append((interaction["user_input"], True))
+            
+            # 添加系统响应（摘要在保存时已生成，旧会话没有摘要时才现场截取）
+            summary = interaction.get("summary")
+            if summary is None:
+                overview = interaction["ai_response"].get("architecture_overview")
+                if overview is not None:
+                    summary = _summarize(overview)
+            if summary is not None:
+                messages.append((f"架构设计已生成/调整:\n\n{summary}", False))
+        
+        # 清空并重建聊天历史，期间暂停重绘和信号，只在最后绘制一次
+        history_panel = self.chat_panel.history_panel
+        history_panel.setUpdatesEnabled(False)
+        history_panel.blockSignals(True)
+        try:
+            self.chat_panel.clear()
+            history_panel.set_history(messages)
+        finally:
+            history_panel.blockSignals(False)
+            history_panel.setUpdatesEnabled(True)
         
         # 如果会话有架构设计，显示最新的架构设计
         if session.current_architecture:
             self.output_panel.display_architecture(session.current_architecture)
         else:
             # 清空输出面板
-            self.output_panel.overview_tab.clear()
-            self.output_panel.components_tab.clear()
-            self.output_panel.decisions_tab.clear()
-            self.output_panel.practices_tab.clear()
-            self.output_panel.json_tab.clear()
-            self.output_panel.diagram_image_label.setText("尚未生成架构图")
-            self.output_panel.clear_mermaid()
+            self.output_panel.reset()
         
         self.statusBar.showMessage(f"已加载会话: {session.name}")
     
-    def _cleanup_empty_sessions(self):
-        """清理没有交互的会话"""
-        sessions_to_delete = []
-        active_session_id = None
+    def _cleanup_empty_sessions(self, refresh=False):
+        """
+        清理没有交互的会话
         
+        Args:
+            refresh: 有会话被删除时是否刷新会话列表
+        """
         # 保存当前活动会话ID
-        if self.session_manager.get_active_session():
-            active_session_id = self.session_manager.get_active_session().session_id
+        active_session = self.session_manager.get_active_session()
+        active_session_id = active_session.session_id if active_session else None
         
-        # 查找没有交互的会话
-        for session_info in self.session_manager.get_all_sessions():
-            session_id = session_info["session_id"]
-            session = self.session_manager.get_session(session_id)
-            
-            # 如果会话没有交互记录，且不是当前活动会话，添加到待删除列表
-            if session and len(session.interactions) == 0 and session_id != active_session_id:
-                sessions_to_delete.append(session_id)
+        # 查找没有交互记录、且不是当前活动会话的会话
+        sessions_to_delete = [
+            session.session_id
+            for session in self.session_manager.iter_sessions()
+            if not session.interactions and session.session_id != active_session_id
+        ]
         
         # 删除空会话
         for session_id in sessions_to_delete:
             self.session_manager.delete_session(session_id)
             
         if sessions_to_delete:
-            print(f"已清理 {len(sessions_to_delete)} 个空会话")
+            logger.info(f"已清理 {len(sessions_to_delete)} 个空会话")
+            if refresh:
+                self.session_panel.refresh()
             
     def _clear_all_sessions(self):
         """清理所有会话"""
@@ -561,22 +694,13 @@ class MainWindow(QMainWindow):
             # 删除所有会话
             count = self.session_manager.delete_all_sessions()
             
-            # 刷新会话列表
-            self.session_panel.refresh()
-            
             # 清空输出面板
-            self.output_panel.overview_tab.clear()
-            self.output_panel.components_tab.clear()
-            self.output_panel.decisions_tab.clear()
-            self.output_panel.practices_tab.clear()
-            self.output_panel.json_tab.clear()
-            self.output_panel.diagram_image_label.setText("尚未生成架构图")
-            self.output_panel.clear_mermaid()
+            self.output_panel.reset()
             
             # 清空聊天面板
             self.chat_panel.clear()
             
-            # 创建新会话
+            # 创建新会话并刷新会话列表
             self.session_manager.create_session()
             self.session_panel.refresh()
             
@@ -590,19 +714,31 @@ class MainWindow(QMainWindow):
             session_id: 会话ID
         """
         # 清空输出面板
-        self.output_panel.overview_tab.clear()
-        self.output_panel.components_tab.clear()
-        self.output_panel.decisions_tab.clear()
-        self.output_panel.practices_tab.clear()
-        self.output_panel.json_tab.clear()
-        self.output_panel.diagram_image_label.setText("尚未生成架构图")
-        self.output_panel.clear_mermaid()
+        self.output_panel.reset()
         
         # 清空聊天面板
         self.chat_panel.clear()
         
         self.statusBar.showMessage("已创建新会话")
         
+    def closeEvent(self, event):
+        """
+        窗口关闭时停止API工作线程，正在进行的API请求结束前先隐藏窗口并继续处理事件
+        
+        Args:
+            event: 关闭事件
+        """
+        self._api_thread.quit()
+        if not self._api_thread.wait(_API_THREAD_POLL_INTERVAL):
+            # API请求无法中途取消，线程必须在销毁前结束，等待期间隐藏窗口，界面不会卡住
+            logger.info("API请求仍在进行，等待请求结束后退出")
+            self._api_worker.result_ready.disconnect()
+            self._api_worker.error_occurred.disconnect()
+            self.hide()
+            while not self._api_thread.wait(_API_THREAD_POLL_INTERVAL):
+                QApplication.processEvents()
+        super().closeEvent(event)
+        
     def _on_splitter_moved(self, pos, index):
         """
         处理分割器移动事件
@@ -611,6 +747,38 @@ class MainWindow(QMainWindow):
             pos: 新位置
             index: 分割器索引
         """
+        if not self._splitter_timer.isActive():
+            self._splitter_timer.start()
+            
+    def _on_resize(self, event):
+        """
+        处理窗口大小变化事件
+        
+        Args:
+            event: 大小变化事件
+        """
+        # 调用父类的resizeEvent
+        super().resizeEvent(event)
+        
+        self._resize_pending = True
+        if not self._splitter_timer.isActive():
+            self._splitter_timer.start()
+    
+    def _apply_splitter_constraints(self):
+        """按窗口大小调整主分割器比例，并限制日志控制台的高度"""
+        # setSizes会再次触发splitterMoved，期间屏蔽信号
+        self.main_splitter.blockSignals(True)
+        try:
+            if self._resize_pending:
+                self._resize_pending = False
+                self._apply_resize_ratio()
+            else:
+                self._apply_drag_limits()
+        finally:
+            self.main_splitter.blockSignals(False)
+    
+    def _apply_drag_limits(self):
+        """分割器拖动后限制上下两部分的高度"""
         # 获取窗口总高度
         total_height = self.height()
         
@@ -626,17 +794,9 @@ class MainWindow(QMainWindow):
         elif sizes[0] < total_height * 0.3:
             # 设置上部分至少有30%的高度
             self.main_splitter.setSizes([int(total_height * 0.3), int(total_height * 0.7)])
-            
-    def _on_resize(self, event):
-        """
-        处理窗口大小变化事件
-        
-        Args:
-            event: 大小变化事件
-        """
-        # 调用父类的resizeEvent
-        super().resizeEvent(event)
-        
+    
+    def _apply_resize_ratio(self):
+        """窗口大小变化后按原比例重新分配分割器高度"""
         # 获取窗口总高度
         total_height = self.height()
         
@@ -645,21 +805,22 @@ class MainWindow(QMainWindow):
         total_size = sum(sizes)
         
         if total_size > 0:
-            # 计算比例
-            ratio_0 = sizes[0] / total_size
-            ratio_1 = sizes[1] / total_size
+            # 计算比例，日志控制台不超过50%
+            ratio_1 = min(sizes[1] / total_size, 0.5)
+            ratio_0 = 1.0 - ratio_1
             
-            # 根据比例重新设置大小
+            # 根据比例一次性设置大小
             self.main_splitter.setSizes([int(total_height * ratio_0), int(total_height * ratio_1)])
-            
-            # 确保日志控制台不超过50%
-            if sizes[1] > total_height * 0.5:
-                self.main_splitter.setSizes([int(total_height * 0.5), int(total_height * 0.5)])
 
 # 日志控制台类
 class LogConsole(QTextEdit):
     """日志控制台"""
     
+    # 日志刷新间隔（毫秒），间隔内的日志合并为一次追加
+    FLUSH_INTERVAL = 50
+    # 控制台不可见期间最多保留的日志条数
+    HIDDEN_BACKLOG = 1000
+    
     def __init__(self):
         """初始化日志控制台"""
         super().__init__()
@@ -670,6 +831,15 @@ class LogConsole(QTextEdit):
         # 设置样式，使其更明显
         self.setStyleSheet("background-color: #f5f5f5; border: 1px solid #ddd;")
         
+        # 创建日志刷新计时器
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL)
+        self._flush_timer.timeout.connect(self._flush)
+        
+        # 控制台不可见期间收到的原始日志记录，显示后再格式化追加
+        self._hidden_records = deque(maxlen=self.HIDDEN_BACKLOG)
+        
         # 设置日志处理器
         self.log_handler = LogHandler(self)
         
@@ -680,6 +850,44 @@ class LogConsole(QTextEdit):
         # 初始化消息
         self.append("日志控制台已初始化，等待日志...")
     
+    @pyqtSlot()
+    def _schedule_flush(self):
+        """安排一次日志刷新"""
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+    
+    def _flush(self):
+        """将缓冲的日志一次性追加到控制台"""
+        batch = self.log_handler.take_batch()
+        
+        # 控制台不可见时只保留原始记录，显示后再格式化
+        if not self.isVisible():
+            self._hidden_records.extend(batch)
+            return
+        
+        if self._hidden_records:
+            self._hidden_records.extend(batch)
+            batch = list(self._hidden_records)
+            self._hidden_records.clear()
+        if not batch:
+            return
+        
+        # 只有在用户没有向上翻看历史日志时才自动滚动
+        scroll_bar = self.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 4
+        
+        self.append("\n".join(self.log_handler.format(record) for record in batch))
+        
+        # 滚动到底部
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+    
+    def showEvent(self, event):
+        """控制台显示时追加不可见期间保留的日志"""
+        super().showEvent(event)
+        if self._hidden_records:
+            self._schedule_flush()
+    
     def clear(self):
         """清空日志"""
         super().clear()
@@ -687,28 +895,42 @@ class LogConsole(QTextEdit):
 
 # 日志处理器类
 class LogHandler(logging.Handler):
-    """日志处理器"""
+    """日志处理器，缓冲日志记录并由控制台定时批量格式化和刷新"""
     
     def __init__(self, console):
         """初始化日志处理器"""
         logging.Handler.__init__(self)
         self.console = console
         self.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._flush_scheduled = False
         
     def emit(self, record):
         """发送日志记录"""
-        msg = self.format(record)
-        # 使用Qt的信号槽机制在UI线程中更新文本
+        # 只缓冲原始记录，格式化推迟到UI线程刷新时进行
+        with self._buffer_lock:
+            self._buffer.append(record)
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        
+        # 使用Qt的信号槽机制在UI线程中安排刷新，每批日志只投递一次
         QMetaObject.invokeMethod(
             self.console, 
-            "append", 
-            Qt.ConnectionType.QueuedConnection,
-            Q_ARG(str, msg)
+            "_schedule_flush", 
+            Qt.ConnectionType.QueuedConnection
         )
-        # 滚动到底部
-        QMetaObject.invokeMethod(
-            self.console.verticalScrollBar(), 
-            "setValue", 
-            Qt.ConnectionType.QueuedConnection,
-            Q_ARG(int, self.console.verticalScrollBar().maximum())
-        )
\ No newline at end of file
+    
+    def take_batch(self):
+        """
+        取出当前缓冲的全部日志
+        
+        Returns:
+            list: 日志记录列表
+        """
+        with self._buffer_lock:
+            batch = self._buffer
+            self._buffer = []
+            self._flush_scheduled = False
+        return batch
\ No newline at end of file
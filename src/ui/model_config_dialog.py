@@ -7,17 +7,90 @@
 """
 
 import os
+import re
+import shutil
+import tempfile
+from functools import partial
+from typing import Dict
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                            QComboBox, QPushButton, QLineEdit, QFormLayout,
                            QGroupBox, QMessageBox, QCheckBox)
-from PyQt6.QtCore import Qt, pyqtSignal
-from dotenv import load_dotenv, set_key, find_dotenv
+from PyQt6.QtCore import Qt, QThreadPool, pyqtSignal, pyqtSlot
+from dotenv import find_dotenv
 from src.api.api_factory import APIFactory
+from src.ui.file_task import FileTask
 from src.utils.logger import get_logger
 
 # 获取日志记录器
 logger = get_logger(__name__)
 
+# 可用的模型类型 (名称, 类型)，进程内不会变化，导入时获取一次
+_AVAILABLE_MODELS = tuple((model["name"], model["type"]) for model in APIFactory.get_available_models())
+
+# 配置项默认值
+_CONFIG_DEFAULTS = {
+    "AI_MODEL_TYPE": APIFactory.DEFAULT_AI_TYPE,
+    "QIANWEN_API_KEY": "",
+    "QIANWEN_MODEL": "qwen-plus",
+    "GEMINI_API_KEY": "",
+    "GEMINI_MODEL": "gemini-pro",
+    "USE_PROXY": "False",
+    "HTTP_PROXY": "",
+    "HTTPS_PROXY": "",
+}
+
+# .env文件中的变量赋值行
+_ENV_LINE_PATTERN = re.compile(r"^\s*(?:export\s+)?([A-Za-z_][A-Za-z0-9_.]*)\s*=")
+
+def _write_env_values(dotenv_path: str, values: Dict[str, str]):
+    """
+    一次性更新.env文件中的多个变量，保留其他行和注释，通过临时文件原子替换
+    
+    Args:
+        dotenv_path: .env文件路径
+        values: 要写入的变量
+    """
+    # 替换符号链接指向的文件，保持链接本身不变
+    dotenv_path = os.path.realpath(dotenv_path)
+    with open(dotenv_path, "r", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    
+    written = set()
+    for i, line in enumerate(lines):
+        match = _ENV_LINE_PATTERN.match(line)
+        if match and match.group(1) in values:
+            key = match.group(1)
+            lines[i] = "{}='{}'".format(key, values[key].replace("'", "\\'"))
+            written.add(key)
+    
+    # 文件中不存在的变量追加到末尾
+    for key, value in values.items():
+        if key not in written:
+            lines.append("{}='{}'".format(key, value.replace("'", "\\'")))
+    
+    # 临时文件创建在同一目录中，并沿用原文件的权限，避免保存API密钥的文件变为其他用户可读
+    fd, tmp_path = tempfile.mkstemp(prefix=".env.", suffix=".tmp", dir=os.path.dirname(dotenv_path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        shutil.copymode(dotenv_path, tmp_path)
+        os.replace(tmp_path, dotenv_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _apply_config(dotenv_path: str, values: Dict[str, str]):
+    """
+    写入配置并立即应用代理设置，在后台线程中执行
+    
+    Args:
+        dotenv_path: .env文件路径
+        values: 要写入的变量
+    """
+    _write_env_values(dotenv_path, values)
+    APIFactory.setup_proxy()
+
 class ModelConfigDialog(QDialog):
     """AI模型配置对话框"""
     
@@ -33,8 +106,10 @@ class ModelConfigDialog(QDialog):
         self.setMinimumWidth(500)
         self.setMinimumHeight(300)
         
-        # 加载环境变量
-        load_dotenv()
+        # 环境变量已在导入APIFactory时从.env加载，这里不再重复加载
+        
+        # 提示框在首次需要时创建，之后重复使用
+        self._msg_box = None
         
         # 创建UI组件
         self._create_ui()
@@ -58,9 +133,10 @@ class ModelConfigDialog(QDialog):
         self.model_type_combo = QComboBox()
         
         # 添加可用的模型类型
-        available_models = APIFactory.get_available_models()
-        for model in available_models:
-            self.model_type_combo.addItem(model["name"], model["type"])
+        self._model_type_index = {}
+        for index, (name, ai_type) in enumerate(_AVAILABLE_MODELS):
+            self.model_type_combo.addItem(name, ai_type)
+            self._model_type_index[ai_type] = index
         
         model_type_layout.addWidget(model_type_label)
         model_type_layout.addWidget(self.model_type_combo, 1)
@@ -97,7 +173,40 @@ class ModelConfigDialog(QDialog):
         # 添加代理组到主布局
         main_layout.addWidget(proxy_group)
         
-        # 创建千问配置组
+        # 各模型的配置组在首次选中该模型时才创建
+        self._config = dict(_CONFIG_DEFAULTS)
+        self._provider_builders = {
+            APIFactory.AI_TYPE_QIANWEN: self._build_qianwen_group,
+            APIFactory.AI_TYPE_GEMINI: self._build_gemini_group,
+        }
+        self._provider_groups = {}
+        self._provider_layout = QVBoxLayout()
+        main_layout.addLayout(self._provider_layout)
+        
+        # 按钮布局
+        button_layout = QHBoxLayout()
+        button_layout.addStretch(1)
+        
+        self.cancel_button = QPushButton("取消")
+        self.save_button = QPushButton("保存")
+        self.save_button.setDefault(True)
+        
+        button_layout.addWidget(self.cancel_button)
+        button_layout.addWidget(self.save_button)
+        
+        main_layout.addLayout(button_layout)
+        
+        # 连接按钮信号
+        self.cancel_button.clicked.connect(self.reject)
+        self.save_button.clicked.connect(self._save_config)
+    
+    def _build_qianwen_group(self) -> QGroupBox:
+        """
+        创建千问配置组，并填入当前配置
+        
+        Returns:
+            QGroupBox: 千问配置组
+        """
         self.qianwen_group = QGroupBox("千问模型配置")
         qianwen_layout = QFormLayout(self.qianwen_group)
         
@@ -106,14 +215,28 @@ class ModelConfigDialog(QDialog):
         self.qianwen_api_key.setPlaceholderText("输入千问API密钥")
         
         self.qianwen_model = QComboBox()
-        self.qianwen_model.addItems(["qwen-turbo", "qwen-plus", "qwen-max"])
+        qianwen_models = ["qwen-turbo", "qwen-plus", "qwen-max"]
+        self.qianwen_model.addItems(qianwen_models)
+        self._qianwen_index = {name: index for index, name in enumerate(qianwen_models)}
         
         qianwen_layout.addRow("API密钥:", self.qianwen_api_key)
         qianwen_layout.addRow("模型版本:", self.qianwen_model)
         
-        main_layout.addWidget(self.qianwen_group)
+        # 加载千问配置
+        self.qianwen_api_key.setText(self._config["QIANWEN_API_KEY"])
+        index = self._qianwen_index.get(self._config["QIANWEN_MODEL"])
+        if index is not None:
+            self.qianwen_model.setCurrentIndex(index)
+        
+        return self.qianwen_group
+    
+    def _build_gemini_group(self) -> QGroupBox:
+        """
+        创建Gemini配置组，并填入当前配置
         
-        # 创建Gemini配置组
+        Returns:
+            QGroupBox: Gemini配置组
+        """
         self.gemini_group = QGroupBox("Gemini模型配置")
         gemini_layout = QFormLayout(self.gemini_group)
         
@@ -122,60 +245,41 @@ class ModelConfigDialog(QDialog):
         self.gemini_api_key.setPlaceholderText("输入Gemini API密钥")
         
         self.gemini_model = QComboBox()
-        self.gemini_model.addItems(["gemini-1.5-flash"])
+        gemini_models = ["gemini-1.5-flash"]
+        self.gemini_model.addItems(gemini_models)
+        self._gemini_index = {name: index for index, name in enumerate(gemini_models)}
         
         gemini_layout.addRow("API密钥:", self.gemini_api_key)
         gemini_layout.addRow("模型版本:", self.gemini_model)
         
-        main_layout.addWidget(self.gemini_group)
-        
-        # 按钮布局
-        button_layout = QHBoxLayout()
-        button_layout.addStretch(1)
-        
-        self.cancel_button = QPushButton("取消")
-        self.save_button = QPushButton("保存")
-        self.save_button.setDefault(True)
-        
-        button_layout.addWidget(self.cancel_button)
-        button_layout.addWidget(self.save_button)
-        
-        main_layout.addLayout(button_layout)
+        # 加载Gemini配置
+        self.gemini_api_key.setText(self._config["GEMINI_API_KEY"])
+        index = self._gemini_index.get(self._config["GEMINI_MODEL"])
+        if index is not None:
+            self.gemini_model.setCurrentIndex(index)
         
-        # 连接按钮信号
-        self.cancel_button.clicked.connect(self.reject)
-        self.save_button.clicked.connect(self._save_config)
+        return self.gemini_group
     
     def _load_current_config(self):
         """加载当前配置"""
+        # 一次性读取所有配置项
+        env = os.environ
+        config = {key: env.get(key, default) for key, default in _CONFIG_DEFAULTS.items()}
+        self._config = config
+        
         # 获取当前AI模型类型
-        current_ai_type = os.getenv("AI_MODEL_TYPE", APIFactory.DEFAULT_AI_TYPE)
+        current_ai_type = config["AI_MODEL_TYPE"]
         
         # 设置当前选中的模型类型
-        for i in range(self.model_type_combo.count()):
-            if self.model_type_combo.itemData(i) == current_ai_type:
-                self.model_type_combo.setCurrentIndex(i)
-                break
-        
-        # 加载千问配置
-        self.qianwen_api_key.setText(os.getenv("QIANWEN_API_KEY", ""))
-        qianwen_model = os.getenv("QIANWEN_MODEL", "qwen-plus")
-        index = self.qianwen_model.findText(qianwen_model)
-        if index >= 0:
-            self.qianwen_model.setCurrentIndex(index)
-        
-        # 加载Gemini配置
-        self.gemini_api_key.setText(os.getenv("GEMINI_API_KEY", ""))
-        gemini_model = os.getenv("GEMINI_MODEL", "gemini-pro")
-        index = self.gemini_model.findText(gemini_model)
-        if index >= 0:
-            self.gemini_model.setCurrentIndex(index)
+        index = self._model_type_index.get(current_ai_type)
+        if index is not None:
+            self.model_type_combo.setCurrentIndex(index)
         
         # 加载代理配置
-        use_proxy = os.getenv("USE_PROXY", "False").lower() == "true"
+        use_proxy = config["USE_PROXY"].lower() == "true"
         self.use_proxy_checkbox.setChecked(use_proxy)
-        self.http_proxy_input.setText(os.getenv("HTTP_PROXY", ""))
-        self.https_proxy_input.setText(os.getenv("HTTPS_PROXY", ""))
+        self.http_proxy_input.setText(config["HTTP_PROXY"])
+        self.https_proxy_input.setText(config["HTTPS_PROXY"])
         
         # 根据代理设置状态更新UI
         self._on_proxy_state_changed()
@@ -183,10 +287,12 @@ class ModelConfigDialog(QDialog):
         # 根据当前选择的模型类型显示/隐藏配置组
         self._update_config_visibility()
     
+    @pyqtSlot()
     def _on_model_type_changed(self):
         """模型类型变更处理"""
         self._update_config_visibility()
     
+    @pyqtSlot()
     def _on_proxy_state_changed(self):
         """代理状态变更处理"""
         # 根据复选框状态启用/禁用代理输入框
@@ -198,76 +304,143 @@ class ModelConfigDialog(QDialog):
         """更新配置组的可见性"""
         current_type = self.model_type_combo.currentData()
         
+        # 首次选中时创建对应的配置组
+        if current_type not in self._provider_groups and current_type in self._provider_builders:
+            group = self._provider_builders[current_type]()
+            self._provider_groups[current_type] = group
+            self._provider_layout.addWidget(group)
+        
         # 显示/隐藏对应的配置组
-        self.qianwen_group.setVisible(current_type == APIFactory.AI_TYPE_QIANWEN)
-        self.gemini_group.setVisible(current_type == APIFactory.AI_TYPE_GEMINI)
+        for ai_type, group in self._provider_groups.items():
+            group.setVisible(ai_type == current_type)
         
         # 调整对话框大小
         self.adjustSize()
     
+    def _show_message(self, icon: QMessageBox.Icon, title: str, text: str):
+        """
+        显示模态提示框，重复使用同一个提示框实例
+        
+        Args:
+            icon: 提示图标
+            title: 标题
+            text: 提示内容
+        """
+        if self._msg_box is None:
+            self._msg_box = QMessageBox(self)
+        self._msg_box.setIcon(icon)
+        self._msg_box.setWindowTitle(title)
+        self._msg_box.setText(text)
+        self._msg_box.exec()
+    
+    @pyqtSlot()
     def _save_config(self):
         """保存配置"""
         try:
             # 获取.env文件路径
             dotenv_path = find_dotenv()
             if not dotenv_path:
-                QMessageBox.critical(self, "配置错误", "找不到.env文件，请确保项目根目录下存在.env文件")
+                self._show_message(QMessageBox.Icon.Critical, "配置错误", "找不到.env文件，请确保项目根目录下存在.env文件")
                 return
             
             # 获取当前选择的模型类型
             current_type = self.model_type_combo.currentData()
             
-            # 保存AI模型类型
-            set_key(dotenv_path, "AI_MODEL_TYPE", current_type)
+            # 收集所有配置项，校验通过后一次性写入
+            values = {"AI_MODEL_TYPE": current_type}
             
             # 根据模型类型保存对应配置
             if current_type == APIFactory.AI_TYPE_QIANWEN:
                 # 保存千问配置
                 qianwen_api_key = self.qianwen_api_key.text().strip()
                 if not qianwen_api_key:
-                    QMessageBox.warning(self, "配置错误", "请输入千问API密钥")
+                    self._show_message(QMessageBox.Icon.Warning, "配置错误", "请输入千问API密钥")
                     return
                 
-                set_key(dotenv_path, "QIANWEN_API_KEY", qianwen_api_key)
-                set_key(dotenv_path, "QIANWEN_MODEL", self.qianwen_model.currentText())
+                values["QIANWEN_API_KEY"] = qianwen_api_key
+                values["QIANWEN_MODEL"] = self.qianwen_model.currentText()
                 
             elif current_type == APIFactory.AI_TYPE_GEMINI:
                 # 保存Gemini配置
                 gemini_api_key = self.gemini_api_key.text().strip()
                 if not gemini_api_key:
-                    QMessageBox.warning(self, "配置错误", "请输入Gemini API密钥")
+                    self._show_message(QMessageBox.Icon.Warning, "配置错误", "请输入Gemini API密钥")
                     return
                 
-                set_key(dotenv_path, "GEMINI_API_KEY", gemini_api_key)
-                set_key(dotenv_path, "GEMINI_MODEL", self.gemini_model.currentText())
+                values["GEMINI_API_KEY"] = gemini_api_key
+                values["GEMINI_MODEL"] = self.gemini_model.currentText()
             
             # 保存代理设置
-            use_proxy = str(self.use_proxy_checkbox.isChecked())
-            set_key(dotenv_path, "USE_PROXY", use_proxy)
+            values["USE_PROXY"] = str(self.use_proxy_checkbox.isChecked())
             
             if self.use_proxy_checkbox.isChecked():
                 http_proxy = self.http_proxy_input.text().strip()
                 https_proxy = self.https_proxy_input.text().strip()
                 
                 if not http_proxy or not https_proxy:
-                    QMessageBox.warning(self, "配置错误", "请输入HTTP和HTTPS代理地址")
+                    self._show_message(QMessageBox.Icon.Warning, "配置错误", "请输入HTTP和HTTPS代理地址")
                     return
                 
-                set_key(dotenv_path, "HTTP_PROXY", http_proxy)
-                set_key(dotenv_path, "HTTPS_PROXY", https_proxy)
-            
-            # 立即应用代理设置
-            APIFactory.setup_proxy()
-            
-            # 发送配置已更改信号
-            self.model_config_changed.emit(current_type)
-            
-            # 提示保存成功
-            QMessageBox.information(self, "保存成功", f"AI模型配置已保存，当前使用: {self.model_type_combo.currentText()}")
+                values["HTTP_PROXY"] = http_proxy
+                values["HTTPS_PROXY"] = https_proxy
             
-            # 关闭对话框
-            self.accept()
+            # 在线程池中写入.env并应用代理设置，写入期间禁用按钮防止重复保存
+            self._set_buttons_enabled(False)
+            task = FileTask(
+                partial(_apply_config, dotenv_path, values),
+                f"AI模型配置已保存，当前使用: {self.model_type_combo.currentText()}",
+                "保存失败",
+                "保存配置时发生错误"
+            )
+            task.signals.succeeded.connect(partial(self._on_config_saved, current_type))
+            task.signals.failed.connect(self._on_config_save_failed)
+            QThreadPool.globalInstance().start(task)
             
         except Exception as e:
             logger.error(f"保存配置失败: {str(e)}")
-            QMessageBox.critical(self, "保存失败", f"保存配置时发生错误: {str(e)}")
\ No newline at end of file
+            self._show_message(QMessageBox.Icon.Critical, "保存失败", f"保存配置时发生错误: {str(e)}")
+    
+    def _set_buttons_enabled(self, enabled: bool):
+        """
+        设置保存和取消按钮的可用状态
+        
+        Args:
+            enabled: 是否可用
+        """
+        self.save_button.setEnabled(enabled)
+        self.cancel_button.setEnabled(enabled)
+    
+    def reject(self):
+        """关闭对话框，保存进行中时忽略，等待保存结果"""
+        if not self.save_button.isEnabled():
+            return
+        super().reject()
+    
+    def _on_config_saved(self, model_type: str, message: str):
+        """
+        配置保存完成
+        
+        Args:
+            model_type: 保存的模型类型
+            message: 提示信息
+        """
+        # 发送配置已更改信号
+        self.model_config_changed.emit(model_type)
+        
+        # 提示保存成功
+        self._show_message(QMessageBox.Icon.Information, "保存成功", message)
+        
+        # 关闭对话框
+        self.accept()
+    
+    @pyqtSlot(str, str)
+    def _on_config_save_failed(self, title: str, message: str):
+        """
+        配置保存失败
+        
+        Args:
+            title: 对话框标题
+            message: 错误信息
+        """
+        self._set_buttons_enabled(True)
+        self._show_message(QMessageBox.Icon.Critical, title, message)
\ No newline at end of file
@@ -7,41 +7,383 @@
 """
 
 import os
+import re
 import json
+import string
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import shutil
+from collections import OrderedDict
+from functools import partial, lru_cache
+from typing import Dict, Any, Optional, Callable, Union
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                           QTextEdit, QTabWidget, QScrollArea, QMessageBox,
-                           QPushButton, QSplitter)
-from PyQt6.QtGui import QFont, QPixmap
-from PyQt6.QtCore import Qt
+                           QTextEdit, QPlainTextEdit, QTabWidget, QScrollArea, QMessageBox,
+                           QPushButton, QSplitter, QApplication)
+from PyQt6.QtGui import (QFont, QFontDatabase, QPixmap, QImage, QImageReader,
+                         QTextCursor, QTextCharFormat, QTextListFormat)
+from PyQt6.QtCore import (Qt, QByteArray, QObject, QProcess, QRunnable, QSize, QThreadPool, QTimer, QUrl,
+                          pyqtSignal, pyqtSlot)
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
 from PyQt6.QtWebEngineWidgets import QWebEngineView
 
+# QtSvgWidgets为可选模块，与mermaid-cli一起用于不依赖浏览器内核的预览
+try:
+    from PyQt6.QtSvgWidgets import QSvgWidget
+except ImportError:
+    QSvgWidget = None
+
+# orjson为可选依赖，安装后用于加速JSON序列化
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.diagram.diagram_generator import DiagramGenerator
 from src.diagram.mermaid_generator import MermaidGenerator
+from src.ui.throttle import qthrottled
+from src.utils.disk_cache import ensure_cache_dir, get_cache_dir, prune_cache_dir, touch_cache_file
 from src.utils.logger import get_logger
 
 # 获取日志记录器
 logger = get_logger(__name__)
 
+def _dump_json(data: Any) -> bytes:
+    """
+    将数据序列化为UTF-8编码的JSON字节，安装了orjson时直接生成字节，不经过中间字符串
+    
+    Args:
+        data: 可序列化为JSON的数据
+        
+    Returns:
+        bytes: JSON数据
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson不支持的类型交给标准库处理
+            pass
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+# HTML转义表，一次str.translate完成所有字符的替换
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+
+def _escape_html(value: Any) -> str:
+    """
+    转义插入HTML的文本
+    
+    Args:
+        value: 文本或可转换为文本的值
+        
+    Returns:
+        str: 转义后的文本
+    """
+    return str(value).translate(_HTML_ESCAPE_TABLE)
+
+# 选项卡HTML片段模板，预先绑定format方法
+_OVERVIEW_HTML = "<h3>架构概述</h3><p>{0}</p>".format
+_LIST_LI = "<li>{0}</li>".format
+
+# Markdown导出的片段模板
+_COMPONENT_MD = "### {0}\n\n- **服务类型**: {1}\n- **描述**: {2}\n\n".format
+_NUMBERED_MD = "{0}. {1}\n".format
+
+# Mermaid代码的行格式：连接（可带标签）、圆柱形节点、矩形节点、菱形节点
+# 以graph、class开头的图表定义和样式行不作为节点
+_MERMAID_LINE_PATTERN = re.compile(r"""
+    ^[ \t]*(?:
+        (?P<src>[^\n]*?)[ \t]*-->[ \t]*(?:\|(?P<label>[^|\n]*)\|[ \t]*)?(?P<dst>[^\n]*?)[ \t]*(?=-->|$)
+      | (?!graph|class)(?P<cylinder_id>[^\[\n]*?)[ \t]*\[\((?P<cylinder>[^\n]*?)\)\]
+      | (?!graph|class)(?P<box_id>[^\[(\n]*?)[ \t]*\[(?P<box>[^\]\n]*)\]
+      | (?!graph|class)(?P<rhombus_id>[^{\n]*?)[ \t]*\{(?P<rhombus>[^}\n]*)\}
+    )
+""", re.MULTILINE | re.VERBOSE)
+
+# 节点ID中的括号和空格统一替换为分隔符，分隔符之前的部分即为节点ID
+_NODE_ID_SEPARATOR = "\x00"
+_NODE_ID_CLEAN_TABLE = str.maketrans({char: _NODE_ID_SEPARATOR for char in "[](){}> "})
+
+# 节点内容中分隔名称和类型的换行标签
+_MERMAID_BR_PATTERN = re.compile(r"<br\s*/?>")
+
+# 各形状节点未标明类型时的默认类型
+_MERMAID_DEFAULT_TYPES = {"box": "Generic", "cylinder": "Database", "rhombus": "APIGateway"}
+
+# Mermaid库：优先使用安装时下载到本地的副本，不存在时从CDN加载
+_MERMAID_CDN_URL = "https://cdn.jsdelivr.net/npm/mermaid@10.2.3/dist/mermaid.min.js"
+_MERMAID_LOCAL_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                                  "resources", "js")
+_MERMAID_LOCAL_FILE = "mermaid.min.js"
+
+# 使用mermaid-cli渲染时，SVG按源码键缓存在此目录中
+_MERMAID_SVG_CACHE_DIR = get_cache_dir("mermaid")
+# SVG缓存目录最多保留的文件数和总大小，超出时淘汰最久未使用的SVG
+_MERMAID_SVG_CACHE_MAX_ENTRIES = 500
+_MERMAID_SVG_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Mermaid预览页面，只加载一次，之后通过JavaScript在页面内更新图表
+# 渲染结束后通过修改页面标题通知程序："状态:源码键:序号"
+_MERMAID_PREVIEW_PAGE = string.Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <script src="$mermaid_src"></script>
+    <script>
+        // Mermaid库加载失败时仍然定义下面的函数，渲染时报告错误
+        if (window.mermaid) {
+            mermaid.initialize({
+                startOnLoad: false,
+                theme: 'default',
+                securityLevel: 'loose'
+            });
+        }
+        
+        var renderCount = 0;
+        window.lastSvg = null;
+        
+        function showMessage(text, isError) {
+            var error = document.getElementById('error-message');
+            error.textContent = text || "";
+            error.style.display = isError ? 'block' : 'none';
+        }
+        
+        // 渲染Mermaid源码，完成后把SVG保存在window.lastSvg中
+        window.renderMermaid = async function(src, key) {
+            try {
+                var result = await mermaid.render('diagram-' + (++renderCount), src);
+                document.getElementById('target').innerHTML = result.svg;
+                window.lastSvg = result.svg;
+                showMessage("", false);
+                console.log("Mermaid图表渲染完成");
+                // 通知父窗口渲染完成
+                window.parent.postMessage('mermaid-rendered', '*');
+                document.title = 'rendered:' + key + ':' + renderCount;
+            } catch (e) {
+                console.error("Mermaid渲染错误:", e);
+                showMessage("图表渲染错误: " + e.message, true);
+                document.title = 'failed:' + key + ':' + renderCount;
+            }
+        };
+        
+        // 直接显示缓存的SVG
+        window.showSvg = function(svg) {
+            document.getElementById('target').innerHTML = svg;
+            showMessage("", false);
+        };
+        
+        // 清空预览
+        window.clearPreview = function() {
+            document.getElementById('target').innerHTML = "<p>尚未生成架构图</p>";
+            showMessage("", false);
+        };
+    </script>
+    <style>
+        #error-message {
+            display: none;
+            color: red;
+            padding: 10px;
+            border: 1px solid red;
+            margin: 10px 0;
+        }
+        .mermaid {
+            width: 100%;
+        }
+    </style>
+</head>
+<body>
+    <div id="error-message"></div>
+    <div id="target" class="mermaid"><p>尚未生成架构图</p></div>
+</body>
+</html>
+""")
+
+@lru_cache(maxsize=None)
+def _preview_profile() -> QWebEngineProfile:
+    """
+    获取Mermaid预览使用的浏览器配置，使用磁盘HTTP缓存以便脚本在重启后无需重新下载和编译
+    
+    Returns:
+        QWebEngineProfile: 持久化的浏览器配置，与应用程序同生命周期
+    """
+    profile = QWebEngineProfile("arch-agent-preview", QApplication.instance())
+    profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+    return profile
+
+@lru_cache(maxsize=None)
+def _monospace_font() -> QFont:
+    """
+    获取代码和JSON显示使用的等宽字体，只创建一次
+    
+    Returns:
+        QFont: 系统等宽字体
+    """
+    font = QFontDatabase.systemFont(QFontDatabase.SystemFont.FixedFont)
+    font.setPointSize(10)
+    return font
+
+class JsonTaskSignals(QObject):
+    """JSON序列化任务的信号"""
+    
+    # 完成信号：任务编号、JSON数据
+    finished = pyqtSignal(int, object)
+
+class JsonTask(QRunnable):
+    """在线程池中序列化架构数据，避免大型架构的JSON格式化阻塞界面"""
+    
+    def __init__(self, task_id, architecture_data):
+        """
+        初始化JSON序列化任务
+        
+        Args:
+            task_id: 任务编号，用于丢弃过期的结果
+            architecture_data: 架构设计数据
+        """
+        super().__init__()
+        self.task_id = task_id
+        self.architecture_data = architecture_data
+        self.signals = JsonTaskSignals()
+    
+    def run(self):
+        """序列化架构数据"""
+        try:
+            self.signals.finished.emit(self.task_id, _dump_json(self.architecture_data))
+        except Exception as e:
+            # 失败时不发送结果，需要时会在界面线程中重新序列化并报告错误
+            logger.error(f"序列化架构数据失败: {str(e)}")
+
+class DiagramTaskSignals(QObject):
+    """架构图生成任务的信号"""
+    
+    # 完成信号：任务编号、架构图路径、Mermaid代码
+    finished = pyqtSignal(int, str, str)
+    # 失败信号：任务编号、错误信息
+    failed = pyqtSignal(int, str)
+
+class DiagramTask(QRunnable):
+    """在线程池中生成架构图和Mermaid代码，避免Graphviz渲染阻塞界面"""
+    
+    def __init__(self, task_id, architecture_data, diagram_generator, mermaid_generator=None):
+        """
+        初始化架构图生成任务
+        
+        Args:
+            task_id: 任务编号，用于丢弃过期的结果
+            architecture_data: 架构设计数据
+            diagram_generator: 架构图生成器
+            mermaid_generator: Mermaid代码生成器，为None时不生成Mermaid代码
+        """
+        super().__init__()
+        self.task_id = task_id
+        self.architecture_data = architecture_data
+        self.diagram_generator = diagram_generator
+        self.mermaid_generator = mermaid_generator
+        self.signals = DiagramTaskSignals()
+    
+    def run(self):
+        """生成架构图和Mermaid代码"""
+        try:
+            logger.info("开始生成架构图")
+            diagram_path = self.diagram_generator.generate_diagram(self.architecture_data)
+            mermaid_code = ""
+            if self.mermaid_generator is not None:
+                mermaid_code = self.mermaid_generator.generate_diagram(self.architecture_data)
+            self.signals.finished.emit(self.task_id, diagram_path, mermaid_code)
+        except Exception as e:
+            logger.error(f"生成架构图失败: {str(e)}")
+            self.signals.failed.emit(self.task_id, str(e))
+
 class OutputPanel(QWidget):
     """输出面板，用于显示架构设计结果"""
     
+    # 每级缩放的倍数
+    ZOOM_FACTOR = 1.2
+    # 缩放比例范围，避免深度放大时分配过大的图像
+    MIN_SCALE = 0.1
+    MAX_SCALE = 4.0
+    # 缩放结果缓存的最大条目数和最大总像素数（约256MB）
+    SCALED_CACHE_SIZE = 16
+    SCALED_CACHE_PIXELS = 64 * 1024 * 1024
+    # 停止缩放后延迟进行平滑缩放的时间（毫秒）
+    SMOOTH_ZOOM_DELAY = 150
+    # Mermaid渲染结果缓存的最大条目数
+    MERMAID_CACHE_SIZE = 64
+    
     def __init__(self):
         """初始化输出面板"""
         super().__init__()
         
         # 初始化属性
         self.architecture_data = None
+        # 当前架构数据序列化后的JSON，供JSON选项卡和保存共用，数据变化时清空
+        self._architecture_json = None
+        # 上次从Mermaid代码解析的结果：(代码哈希, 架构数据)
+        self._parsed_mermaid = None
+        # 最近一次JSON序列化任务的编号，只接受最新任务的结果
+        self._json_task_id = 0
+        # 上次显示的架构数据和架构图对应的内容键，内容未变化时跳过重新渲染
+        self._architecture_key = None
+        self._diagram_key = None
+        # 最近一次架构图生成任务的编号和内容键，只接受最新任务的结果
+        self._diagram_task_id = 0
+        self._pending_diagram_key = None
+        # 最近一次架构图生成任务是否来自Mermaid编辑器，完成后只显示架构图并提示结果
+        self._diagram_from_mermaid = False
         self.diagram_image = None
-        self.original_pixmap = None
-        self.current_scale = 1.0
+        # 当前架构图的文件路径和原始尺寸，原始分辨率的图像在需要时才解码
+        self._diagram_path = None
+        self._original_size = None
+        self._original_pixmap = None
+        # 缩放比例 = 基准比例 * ZOOM_FACTOR ** 缩放级数
+        self._zoom_base = 1.0
+        self._zoom_step = 0
+        # 缩放结果缓存：(宽, 高) -> QPixmap，按最近使用顺序淘汰
+        self._scaled_cache = OrderedDict()
+        self._scaled_cache_pixels = 0
+        # 连续缩放时先快速缩放，停止点击后再平滑缩放
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(self.SMOOTH_ZOOM_DELAY)
+        self._smooth_timer.timeout.connect(partial(self._update_scaled_image, log=False))
+        # 连续点击缩放按钮时，每帧（16毫秒）最多缩放一次，只显示最后的缩放级数
+        self._throttled_zoom = qthrottled(partial(self._update_scaled_image, fast=True), 16)
         self.diagram_generator = DiagramGenerator()
         self.mermaid_generator = MermaidGenerator()
         self.mermaid_preloaded = False
         self.auto_preview = True  # 自动预览开关
         
+        # Mermaid自动预览的延迟计时器，编辑停止500毫秒后再渲染
+        self._preview_timer = QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(500)
+        self._preview_timer.timeout.connect(self._preview_mermaid)
+        
+        # 窗口大小变化时合并分割器更新，拖动窗口期间每帧最多调整一次
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(16)
+        self._resize_timer.timeout.connect(self._apply_splitter_sizes)
+        
+        # Mermaid渲染结果缓存：源码键 -> SVG，以及当前预览和正在渲染的源码键
+        self._mermaid_svg_cache = OrderedDict()
+        self._last_mermaid_key = None
+        self._rendering_mermaid_key = None
+        # 预览页面是否已加载完成，以及加载完成前是否有待预览的源码
+        self._mermaid_ready = False
+        self._mermaid_preview_pending = False
+        # 安装了mermaid-cli时用它渲染SVG，预览不需要浏览器内核
+        self._mmdc_path = shutil.which("mmdc") if QSvgWidget is not None else None
+        self._mmdc_process = None
+        self._mmdc_run = 0
+        
+        # 延迟创建的文本选项卡：选项卡索引 -> 键，已创建的文本框，以及待显示的内容
+        self._lazy_tabs = {}
+        self._text_tabs = {}
+        self._text_tab_content = {}
+        # 已创建但内容尚未填充的文本选项卡，切换到该选项卡时再填充
+        self._stale_text_tabs = set()
+        
         # 创建UI组件
         self._create_ui()
         
@@ -63,14 +405,10 @@ class OutputPanel(QWidget):
         self.tab_widget = QTabWidget()
         
         # 创建概述选项卡
-        self.overview_tab = QTextEdit()
-        self.overview_tab.setReadOnly(True)
-        self.tab_widget.addTab(self.overview_tab, "架构概述")
+        self._add_lazy_text_tab("overview", "架构概述")
         
         # 创建组件选项卡
-        self.components_tab = QTextEdit()
-        self.components_tab.setReadOnly(True)
-        self.tab_widget.addTab(self.components_tab, "架构组件")
+        self._add_lazy_text_tab("components", "架构组件")
         
         # 创建图表选项卡
         self.diagram_tab = QScrollArea()
@@ -128,7 +466,7 @@ class OutputPanel(QWidget):
         # 创建Mermaid代码编辑器
         self.mermaid_editor = QTextEdit()
         self.mermaid_editor.setReadOnly(False)
-        self.mermaid_editor.setFont(QFont("Courier New", 10))
+        self.mermaid_editor.setFont(_monospace_font())
         self.mermaid_editor.textChanged.connect(self._on_mermaid_text_changed)
         edit_layout.addWidget(QLabel("Mermaid代码 (可编辑):"))
         edit_layout.addWidget(self.mermaid_editor)
@@ -138,7 +476,7 @@ class OutputPanel(QWidget):
         
         # 创建预览按钮
         preview_button = QPushButton("预览")
-        preview_button.clicked.connect(self._preview_mermaid)
+        preview_button.clicked.connect(self._force_preview_mermaid)
         buttons_layout.addWidget(preview_button)
         
         # 创建自动预览切换按钮
@@ -173,9 +511,19 @@ class OutputPanel(QWidget):
         
         preview_layout.addLayout(preview_header)
         
-        self.mermaid_preview = QWebEngineView()
-        # 连接加载完成信号
-        self.mermaid_preview.loadFinished.connect(self._on_preview_load_finished)
+        if self._mmdc_path:
+            logger.info(f"使用mermaid-cli渲染Mermaid预览: {self._mmdc_path}")
+            self.mermaid_preview = QSvgWidget()
+            renderer = self.mermaid_preview.renderer()
+            if hasattr(renderer, "setAspectRatioMode"):
+                renderer.setAspectRatioMode(Qt.AspectRatioMode.KeepAspectRatio)
+        else:
+            self.mermaid_preview = QWebEngineView()
+            self.mermaid_preview.setPage(QWebEnginePage(_preview_profile(), self.mermaid_preview))
+            # 连接加载完成信号
+            self.mermaid_preview.loadFinished.connect(self._on_preview_load_finished)
+            # 渲染完成后页面会修改标题，据此取回渲染出的SVG
+            self.mermaid_preview.titleChanged.connect(self._on_preview_title_changed)
         preview_layout.addWidget(self.mermaid_preview)
         
         # 将编辑区和预览区添加到分割器
@@ -190,124 +538,208 @@ class OutputPanel(QWidget):
         self.tab_widget.addTab(self.mermaid_tab, "可编辑图表")
         
         # 创建决策选项卡
-        self.decisions_tab = QTextEdit()
-        self.decisions_tab.setReadOnly(True)
-        self.tab_widget.addTab(self.decisions_tab, "设计决策")
+        self._add_lazy_text_tab("decisions", "设计决策")
         
         # 创建最佳实践选项卡
-        self.practices_tab = QTextEdit()
-        self.practices_tab.setReadOnly(True)
-        self.tab_widget.addTab(self.practices_tab, "最佳实践")
+        self._add_lazy_text_tab("practices", "最佳实践")
         
         # 创建JSON选项卡
-        self.json_tab = QTextEdit()
-        self.json_tab.setReadOnly(True)
-        self.json_tab.setFont(QFont("Courier New", 10))
-        self.tab_widget.addTab(self.json_tab, "原始JSON")
+        self._add_lazy_text_tab("json", "原始JSON")
+        
+        # 文本选项卡在首次显示时才创建和填充
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+        self._ensure_tab_built(self.tab_widget.currentIndex())
         
         # 将选项卡控件添加到主布局
         main_layout.addWidget(self.tab_widget)
     
+    def _add_lazy_text_tab(self, key: str, title: str):
+        """
+        添加延迟创建的文本选项卡，先放置占位控件
+        
+        Args:
+            key: 选项卡键
+            title: 选项卡标题
+        """
+        index = self.tab_widget.addTab(QWidget(), title)
+        self._lazy_tabs[index] = key
+    
+    def _ensure_tab_built(self, index: int):
+        """
+        首次显示选项卡时创建文本框，替换占位控件并填充待显示的内容
+        
+        Args:
+            index: 选项卡索引
+        """
+        key = self._lazy_tabs.pop(index, None)
+        if key is None:
+            return
+        
+        if key == "json":
+            # JSON为纯文本，QPlainTextEdit按行布局，大文档也能快速显示
+            text_edit = QPlainTextEdit()
+            text_edit.setFont(_monospace_font())
+            text_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+        else:
+            text_edit = QTextEdit()
+        text_edit.setReadOnly(True)
+        self._text_tabs[key] = text_edit
+        
+        if key in self._text_tab_content:
+            self._apply_text_tab_content(text_edit, *self._text_tab_content[key])
+            self._stale_text_tabs.discard(key)
+        
+        # 替换占位控件，期间屏蔽信号避免重入
+        self.tab_widget.blockSignals(True)
+        try:
+            current_index = self.tab_widget.currentIndex()
+            placeholder = self.tab_widget.widget(index)
+            title = self.tab_widget.tabText(index)
+            self.tab_widget.removeTab(index)
+            self.tab_widget.insertTab(index, text_edit, title)
+            self.tab_widget.setCurrentIndex(current_index)
+            placeholder.deleteLater()
+        finally:
+            self.tab_widget.blockSignals(False)
+    
+    def _on_tab_changed(self, index: int):
+        """
+        切换选项卡时创建尚未创建的文本框，并填充内容已过期的文本框
+        
+        Args:
+            index: 选项卡索引
+        """
+        self._ensure_tab_built(index)
+        
+        widget = self.tab_widget.widget(index)
+        for key in list(self._stale_text_tabs):
+            if self._text_tabs.get(key) is widget:
+                self._stale_text_tabs.discard(key)
+                self._apply_text_tab_content(widget, *self._text_tab_content[key])
+                break
+    
+    @staticmethod
+    def _apply_text_tab_content(text_edit: Union[QTextEdit, QPlainTextEdit], text: Union[str, Callable],
+                                is_html: Optional[bool]):
+        """将内容填充到文本框，内容为可调用对象时在此时才生成"""
+        if is_html is None:
+            # 内容为写入函数，通过QTextCursor直接写入文档，不经过HTML解析
+            text_edit.clear()
+            cursor = QTextCursor(text_edit.document())
+            cursor.beginEditBlock()
+            text(cursor)
+            cursor.endEditBlock()
+            return
+        if callable(text):
+            text = text()
+        if is_html:
+            text_edit.setHtml(text)
+        else:
+            text_edit.setPlainText(text)
+    
+    def _set_text_tab(self, key: str, text: Union[str, Callable], is_html: Optional[bool] = True):
+        """
+        设置文本选项卡内容，只有当前显示的选项卡立即填充，其余选项卡在切换到时再填充
+        
+        Args:
+            key: 选项卡键
+            text: 内容，或生成内容的可调用对象，或接收QTextCursor的写入函数
+            is_html: 是否为HTML内容，为None时text为写入函数
+        """
+        self._text_tab_content[key] = (text, is_html)
+        text_edit = self._text_tabs.get(key)
+        if text_edit is None:
+            return
+        
+        if self.tab_widget.currentWidget() is text_edit:
+            self._stale_text_tabs.discard(key)
+            self._apply_text_tab_content(text_edit, text, is_html)
+        else:
+            self._stale_text_tabs.add(key)
+    
     def _preload_mermaid(self):
-        """预加载Mermaid库，提高首次渲染速度"""
+        """加载Mermaid预览页面，之后的预览只在页面内更新图表"""
+        if self._mmdc_path:
+            # 使用mermaid-cli时没有需要加载的页面
+            self._mermaid_ready = True
+            self.mermaid_preloaded = True
+            return
+        
         logger.info("预加载Mermaid库...")
+        self._mermaid_ready = False
         
-        # 创建一个简单的HTML页面，预加载Mermaid库
-        html = """
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <script src="https://cdn.jsdelivr.net/npm/mermaid@10.2.3/dist/mermaid.min.js"></script>
-            <script>
-                // 预加载完成后设置标志
-                window.onload = function() {
-                    console.log("Mermaid库预加载完成");
-                    window.mermaidLoaded = true;
-                    
-                    // 初始化Mermaid
-                    mermaid.initialize({
-                        startOnLoad: true,
-                        theme: 'default',
-                        securityLevel: 'loose'
-                    });
-                };
-            </script>
-        </head>
-        <body>
-            <div class="mermaid">
-                graph TD
-                A[预加载] --> B[完成]
-            </div>
-        </body>
-        </html>
-        """
-        self.mermaid_preview.setHtml(html)
+        if os.path.exists(os.path.join(_MERMAID_LOCAL_DIR, _MERMAID_LOCAL_FILE)):
+            # 以本地目录为基础URL，页面可以直接引用本地的Mermaid库
+            html = _MERMAID_PREVIEW_PAGE.substitute(mermaid_src=_MERMAID_LOCAL_FILE)
+            self.mermaid_preview.setHtml(html, QUrl.fromLocalFile(_MERMAID_LOCAL_DIR + os.sep))
+        else:
+            logger.info("未找到本地Mermaid库，从CDN加载")
+            self.mermaid_preview.setHtml(_MERMAID_PREVIEW_PAGE.substitute(mermaid_src=_MERMAID_CDN_URL))
         self.mermaid_preloaded = True
     
+    @staticmethod
+    def _mermaid_key(mermaid_code: str) -> str:
+        """
+        计算Mermaid源码的内容键，忽略空白行、行首尾空白和注释行，%%{...}%%指令会影响渲染，不能忽略
+        
+        Args:
+            mermaid_code: Mermaid源码
+            
+        Returns:
+            str: 内容键
+        """
+        lines = (line.strip() for line in mermaid_code.splitlines())
+        normalized = "\n".join(
+            line for line in lines
+            if line and (not line.startswith("%%") or line.startswith("%%{"))
+        )
+        return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+    
+    @pyqtSlot()
+    def _force_preview_mermaid(self):
+        """手动预览Mermaid图表，即使源码未变化也重新渲染，预览页面加载失败时重新加载"""
+        self._last_mermaid_key = None
+        if not self._mermaid_ready:
+            self._preload_mermaid()
+        self._preview_mermaid()
+    
     def _preview_mermaid(self):
-        """预览Mermaid图表"""
+        """预览Mermaid图表，源码未变化时跳过，渲染过的源码直接显示缓存的SVG"""
         mermaid_code = self.mermaid_editor.toPlainText()
-        logger.info(f"预览Mermaid图表，代码长度: {len(mermaid_code)}")
+        logger.debug("预览Mermaid图表，代码长度: %d", len(mermaid_code))
         
         if not mermaid_code.strip():
             logger.warning("Mermaid代码为空，无法预览")
             return
-            
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <script src="https://cdn.jsdelivr.net/npm/mermaid@10.2.3/dist/mermaid.min.js"></script>
-            <script>
-                // 确保mermaid库加载完成后再初始化
-                document.addEventListener('DOMContentLoaded', function() {{
-                    mermaid.initialize({{
-                        startOnLoad: true,
-                        theme: 'default',
-                        securityLevel: 'loose'
-                    }});
-                }});
-                
-                // 使用多种方式确保图表渲染
-                window.onload = function() {{
-                    setTimeout(function() {{
-                        try {{
-                            mermaid.run();
-                            console.log("Mermaid图表渲染完成");
-                            // 通知父窗口渲染完成
-                            window.parent.postMessage('mermaid-rendered', '*');
-                        }} catch (e) {{
-                            console.error("Mermaid渲染错误:", e);
-                            document.getElementById('error-message').textContent = "图表渲染错误: " + e.message;
-                            document.getElementById('error-message').style.display = 'block';
-                        }}
-                    }}, 200); // 减少延迟，因为已经预加载了库
-                }};
-            </script>
-            <style>
-                #error-message {{
-                    display: none;
-                    color: red;
-                    padding: 10px;
-                    border: 1px solid red;
-                    margin: 10px 0;
-                }}
-                .mermaid {{
-                    width: 100%;
-                }}
-            </style>
-        </head>
-        <body>
-            <div id="error-message"></div>
-            <div class="mermaid">
-{mermaid_code}
-            </div>
-        </body>
-        </html>
-        """
-        self.mermaid_preview.setHtml(html)
+        
+        # 预览页面尚未加载完成时，等加载完成后再预览编辑器中的最新源码
+        if not self._mermaid_ready:
+            self._mermaid_preview_pending = True
+            return
+        
+        key = self._mermaid_key(mermaid_code)
+        if key == self._last_mermaid_key:
+            logger.info("Mermaid代码未变化，跳过重新渲染")
+            if self._rendering_mermaid_key is None:
+                self._set_preview_status("预览已更新", "color: green;")
+            return
+        self._last_mermaid_key = key
+        
+        if self._mmdc_path:
+            self._render_with_mmdc(mermaid_code, key)
+            return
+        
+        page = self.mermaid_preview.page()
+        svg = self._mermaid_svg_cache.get(key)
+        if svg is not None:
+            self._mermaid_svg_cache.move_to_end(key)
+            self._rendering_mermaid_key = None
+            page.runJavaScript(f"showSvg({json.dumps(svg)})")
+            self._set_preview_status("预览已更新", "color: green;")
+            return
+        
+        self._rendering_mermaid_key = key
+        page.runJavaScript(f"renderMermaid({json.dumps(mermaid_code)}, {json.dumps(key)})")
     
     def display_architecture(self, architecture_data: Dict[str, Any]):
         """
@@ -317,65 +749,246 @@ class OutputPanel(QWidget):
             architecture_data: 架构设计数据
         """
         try:
+            architecture_key = self._content_key(architecture_data)
+            if self.architecture_data is not None and architecture_key == self._architecture_key:
+                logger.info("架构设计数据未变化，跳过重新显示")
+                return
+            
             self.architecture_data = architecture_data
+            self._architecture_json = None
+            self._architecture_key = architecture_key
             
             # 显示架构概述
             if "architecture_overview" in architecture_data:
-                self.overview_tab.setHtml("<h3>架构概述</h3><p>{0}</p>".format(architecture_data['architecture_overview']))
+                self._set_text_tab("overview", _OVERVIEW_HTML(_escape_html(architecture_data['architecture_overview'])))
             
             # 显示架构组件
             if "components" in architecture_data:
-                components_html = "<h3>架构组件</h3><ul>"
-                for component in architecture_data["components"]:
-                    name = component.get('name', '')
-                    service_type = component.get('service_type', '')
-                    description = component.get('description', '')
-                    components_html += "<li><b>{0}</b> ({1}): {2}</li>".format(
-                        name, service_type, description)
-                components_html += "</ul>"
-                self.components_tab.setHtml(components_html)
+                self._set_text_tab("components", partial(self._write_components, architecture_data["components"]),
+                                   is_html=None)
             
             # 显示设计决策
             if "design_decisions" in architecture_data:
-                decisions_html = "<h3>设计决策</h3><ul>"
-                for decision in architecture_data["design_decisions"]:
-                    decisions_html += "<li>{0}</li>".format(decision)
-                decisions_html += "</ul>"
-                self.decisions_tab.setHtml(decisions_html)
+                self._set_text_tab("decisions", self._build_list_html("设计决策", architecture_data["design_decisions"]))
             
             # 显示最佳实践
             if "best_practices" in architecture_data:
-                practices_html = "<h3>最佳实践</h3><ul>"
-                for practice in architecture_data["best_practices"]:
-                    practices_html += "<li>{0}</li>".format(practice)
-                practices_html += "</ul>"
-                self.practices_tab.setHtml(practices_html)
+                self._set_text_tab("practices", self._build_list_html("最佳实践", architecture_data["best_practices"]))
             
-            # 显示原始JSON
-            self.json_tab.setText(json.dumps(architecture_data, ensure_ascii=False, indent=2))
+            # 显示原始JSON，在后台序列化
+            self._start_json_task()
             
             # 生成并显示架构图
-            if "diagram_description" in architecture_data:
-                try:
-                    logger.info("开始生成架构图")
-                    diagram_path = self.diagram_generator.generate_diagram(architecture_data)
-                    self._display_diagram(diagram_path)
-                    
-                    # 生成并显示Mermaid代码
-                    mermaid_code = self.mermaid_generator.generate_diagram(architecture_data)
-                    self.mermaid_editor.setText(mermaid_code)
-                    self._preview_mermaid()
-                except Exception as e:
-                    logger.error(f"生成架构图失败: {str(e)}")
-                    error_msg = str(e)
-                    if "failed to execute" in error_msg and "dot" in error_msg:
-                        self._show_graphviz_error()
-                    else:
-                        self.diagram_image_label.setText(f"生成架构图失败: {error_msg}")
+            # 架构图只依赖图描述和组件列表，二者未变化时沿用已显示的架构图
+            diagram_key = self._content_key([architecture_data.get("diagram_description"),
+                                             architecture_data.get("components")])
+            if "diagram_description" in architecture_data and self._diagram_path is not None \
+                    and diagram_key == self._diagram_key:
+                logger.info("架构图描述未变化，跳过重新生成架构图")
+            elif "diagram_description" in architecture_data:
+                self._start_diagram_task(architecture_data, diagram_key)
         except Exception as e:
             logger.error(f"显示架构设计时发生错误: {str(e)}")
             self.diagram_image_label.setText(f"显示架构设计时发生错误: {str(e)}")
     
+    def _start_diagram_task(self, architecture_data: Dict[str, Any], diagram_key: Optional[int],
+                            from_mermaid: bool = False):
+        """
+        在线程池中生成架构图和Mermaid代码，完成后在界面线程中显示
+        
+        Args:
+            architecture_data: 架构设计数据
+            diagram_key: 架构图内容键
+            from_mermaid: 是否由Mermaid编辑器的代码生成，此时不重新生成Mermaid代码
+        """
+        self._diagram_key = None
+        self._diagram_task_id += 1
+        self._pending_diagram_key = diagram_key
+        self._diagram_from_mermaid = from_mermaid
+        
+        if from_mermaid:
+            self.diagram_image_label.setText("正在从Mermaid代码生成架构图...")
+        else:
+            self.diagram_image_label.setText("正在生成架构图...")
+            self._set_preview_status("生成中...", "color: gray; font-style: italic;")
+        
+        task = DiagramTask(self._diagram_task_id, architecture_data, self.diagram_generator,
+                           None if from_mermaid else self.mermaid_generator)
+        task.signals.finished.connect(self._on_diagram_task_finished)
+        task.signals.failed.connect(self._on_diagram_task_failed)
+        QThreadPool.globalInstance().start(task)
+    
+    @pyqtSlot(int, str, str)
+    def _on_diagram_task_finished(self, task_id: int, diagram_path: str, mermaid_code: str):
+        """
+        架构图生成完成，显示架构图和Mermaid代码
+        
+        Args:
+            task_id: 任务编号
+            diagram_path: 架构图路径
+            mermaid_code: Mermaid代码
+        """
+        if task_id != self._diagram_task_id:
+            logger.info("架构图生成结果已过期，忽略")
+            return
+        
+        self._display_diagram(diagram_path)
+        self._diagram_key = self._pending_diagram_key
+        
+        if self._diagram_from_mermaid:
+            QMessageBox.information(
+                self,
+                "生成成功",
+                "已成功从Mermaid代码生成架构图并更新所有相关面板。"
+            )
+            
+            # 切换到架构图选项卡
+            self.tab_widget.setCurrentIndex(2)  # 架构图是第三个选项卡（索引为2）
+            return
+        
+        # 显示Mermaid代码，屏蔽编辑器信号避免再触发一次延迟预览，这里直接预览一次
+        self.mermaid_editor.blockSignals(True)
+        try:
+            self.mermaid_editor.setPlainText(mermaid_code)
+        finally:
+            self.mermaid_editor.blockSignals(False)
+        self._preview_timer.stop()
+        self._preview_mermaid()
+    
+    @pyqtSlot(int, str)
+    def _on_diagram_task_failed(self, task_id: int, error_msg: str):
+        """
+        架构图生成失败，显示错误信息
+        
+        Args:
+            task_id: 任务编号
+            error_msg: 错误信息
+        """
+        if task_id != self._diagram_task_id:
+            return
+        
+        if self._diagram_from_mermaid:
+            self.diagram_image_label.setText(f"生成架构图失败: {error_msg}")
+            QMessageBox.warning(
+                self,
+                "生成图片失败",
+                f"生成架构图失败: {error_msg}\n\n请检查Graphviz是否正确安装。"
+            )
+            return
+        
+        self._set_preview_status("预览已更新", "color: green;")
+        if "failed to execute" in error_msg and "dot" in error_msg:
+            self._show_graphviz_error()
+        else:
+            self.diagram_image_label.setText(f"生成架构图失败: {error_msg}")
+    
+    @staticmethod
+    def _content_key(data: Any) -> int:
+        """
+        计算数据内容的哈希键，用于判断内容是否变化
+        
+        Args:
+            data: 可序列化为JSON的数据
+            
+        Returns:
+            int: 内容哈希
+        """
+        if orjson is not None:
+            return hash(orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str))
+        return hash(json.dumps(data, sort_keys=True, ensure_ascii=False, default=str))
+    
+    def _start_json_task(self):
+        """在线程池中序列化当前架构数据，完成前JSON选项卡显示提示文本"""
+        self._json_task_id += 1
+        self._set_text_tab("json", "正在生成JSON...", is_html=False)
+        
+        task = JsonTask(self._json_task_id, self.architecture_data)
+        task.signals.finished.connect(self._on_json_task_finished)
+        QThreadPool.globalInstance().start(task)
+    
+    @pyqtSlot(int, object)
+    def _on_json_task_finished(self, task_id: int, data: bytes):
+        """
+        JSON序列化完成，缓存结果并填充JSON选项卡
+        
+        Args:
+            task_id: 任务编号
+            data: JSON数据
+        """
+        if task_id != self._json_task_id:
+            return
+        
+        if self._architecture_json is None:
+            self._architecture_json = data
+        self._set_text_tab("json", self._get_architecture_json_text, is_html=False)
+    
+    def _get_architecture_json(self) -> bytes:
+        """
+        获取当前架构数据的JSON，同一份数据只序列化一次，后台任务尚未完成时直接序列化
+        
+        Returns:
+            bytes: UTF-8编码的JSON数据
+        """
+        if self._architecture_json is None:
+            self._architecture_json = _dump_json(self.architecture_data)
+        return self._architecture_json
+    
+    def _get_architecture_json_text(self) -> str:
+        """
+        获取当前架构数据的JSON文本，用于JSON选项卡
+        
+        Returns:
+            str: JSON文本
+        """
+        return self._get_architecture_json().decode("utf-8")
+    
+    @staticmethod
+    def _write_components(components, cursor: QTextCursor):
+        """
+        通过QTextCursor写入架构组件列表，组件内容作为纯文本插入，无需转义
+        
+        Args:
+            components: 组件列表
+            cursor: 目标文档的光标
+        """
+        bold_format = QTextCharFormat()
+        bold_format.setFontWeight(QFont.Weight.Bold)
+        plain_format = QTextCharFormat()
+        
+        # 与<h3>标题一致的加粗大号字体
+        heading_format = QTextCharFormat(bold_format)
+        point_size = cursor.document().defaultFont().pointSizeF()
+        if point_size > 0:
+            heading_format.setFontPointSize(point_size * 1.2)
+        cursor.insertText("架构组件", heading_format)
+        
+        if not components:
+            return
+        cursor.insertList(QTextListFormat.Style.ListDisc)
+        for i, component in enumerate(components):
+            if i:
+                cursor.insertBlock()
+            cursor.insertText(str(component.get('name', '')), bold_format)
+            cursor.insertText(f" ({component.get('service_type', '')}): {component.get('description', '')}",
+                              plain_format)
+    
+    @staticmethod
+    def _build_list_html(title: str, items) -> str:
+        """
+        构建带标题的HTML列表，列表项内容会被转义
+        
+        Args:
+            title: 标题
+            items: 列表项
+            
+        Returns:
+            str: HTML文本
+        """
+        parts = ["<h3>", title, "</h3><ul>"]
+        parts.extend(_LIST_LI(_escape_html(item)) for item in items)
+        parts.append("</ul>")
+        return "".join(parts)
+    
     def _show_graphviz_error(self):
         """显示Graphviz错误提示"""
         error_html = """
@@ -412,89 +1025,183 @@ class OutputPanel(QWidget):
     
     def _display_diagram(self, diagram_path: str):
         """
-        显示架构图
+        显示架构图，需要缩小显示时直接按目标尺寸解码，不解码原始分辨率的图像
         
         Args:
             diagram_path: 架构图文件路径
         """
         if os.path.exists(diagram_path):
             logger.info(f"加载架构图: {diagram_path}")
-            pixmap = QPixmap(diagram_path)
-            if pixmap.isNull():
+            reader = QImageReader(diagram_path)
+            reader.setAutoTransform(True)
+            size = reader.size()
+            if not size.isValid():
                 logger.error(f"无法加载图片: {diagram_path}")
                 self.diagram_image_label.setText(f"无法加载图片: {diagram_path}")
+                return
+            
+            # 获取显示区域大小
+            screen_size = self.diagram_tab.size()
+            
+            # 默认显示原始大小，以保持文字清晰度；如果图像太大，适当缩小
+            zoom_base = 1.0
+            if size.width() > screen_size.width() * 0.9 or size.height() > screen_size.height() * 0.9:
+                # 计算合适的缩放比例，但不要缩放太多以保持文字清晰
+                width_ratio = screen_size.width() * 0.9 / size.width()
+                height_ratio = screen_size.height() * 0.9 / size.height()
+                zoom_base = max(min(width_ratio, height_ratio), 0.7)  # 不小于70%
+            
+            target = (int(size.width() * zoom_base), int(size.height() * zoom_base))
+            if zoom_base != 1.0:
+                reader.setScaledSize(QSize(*target))
+            image = reader.read()
+            if image.isNull():
+                logger.error(f"无法加载图片: {diagram_path}, {reader.errorString()}")
+                self.diagram_image_label.setText(f"无法加载图片: {diagram_path}")
+                return
+            
+            # 记录新的架构图，之前图像的缩放结果不再可用
+            self._diagram_path = diagram_path
+            self._original_size = size
+            self._clear_scaled_cache()
+            self._zoom_base = zoom_base
+            self._zoom_step = 0
+            
+            pixmap = QPixmap.fromImage(image)
+            if zoom_base == 1.0:
+                self._original_pixmap = pixmap
             else:
-                # 保存原始图像
-                self.original_pixmap = pixmap
-                
-                # 默认显示原始大小，以保持文字清晰度
-                self.diagram_image = pixmap
-                self.current_scale = 1.0
-                
-                # 获取显示区域大小
-                screen_size = self.diagram_tab.size()
-                
-                # 如果图像太大，适当缩小
-                if pixmap.width() > screen_size.width() * 0.9 or pixmap.height() > screen_size.height() * 0.9:
-                    # 计算合适的缩放比例，但不要缩放太多以保持文字清晰
-                    width_ratio = screen_size.width() * 0.9 / pixmap.width()
-                    height_ratio = screen_size.height() * 0.9 / pixmap.height()
-                    scale_ratio = max(min(width_ratio, height_ratio), 0.7)  # 不小于70%
-                    
-                    # 使用高质量缩放
-                    scaled_pixmap = pixmap.scaled(
-                        int(pixmap.width() * scale_ratio),
-                        int(pixmap.height() * scale_ratio),
-                        Qt.AspectRatioMode.KeepAspectRatio,
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    self.diagram_image = scaled_pixmap
-                    self.current_scale = scale_ratio
-                    self.diagram_image_label.setPixmap(scaled_pixmap)
-                else:
-                    # 否则使用原始大小
-                    self.diagram_image_label.setPixmap(pixmap)
-                
-                self.diagram_image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                logger.info(f"架构图显示成功: {diagram_path}, 缩放比例: {self.current_scale:.2f}")
-                
-                # 切换到架构图选项卡
-                self.tab_widget.setCurrentIndex(2)  # 架构图是第三个选项卡（索引为2）
+                self._original_pixmap = None
+                self._cache_scaled_pixmap(target, pixmap)
+            
+            self._update_scaled_image(log=False)
+            
+            self.diagram_image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            logger.info(f"架构图显示成功: {diagram_path}, 缩放比例: {self.current_scale:.2f}")
+            
+            # 切换到架构图选项卡
+            self.tab_widget.setCurrentIndex(2)  # 架构图是第三个选项卡（索引为2）
         else:
             logger.warning(f"架构图文件不存在: {diagram_path}")
             self.diagram_image_label.setText(f"架构图文件不存在: {diagram_path}")
     
+    @property
+    def original_pixmap(self) -> Optional[QPixmap]:
+        """原始分辨率的架构图，首次访问时才从文件解码"""
+        if self._original_pixmap is None and self._diagram_path is not None:
+            self._original_pixmap = QPixmap(self._diagram_path)
+        return self._original_pixmap
+    
+    @property
+    def current_scale(self) -> float:
+        """当前缩放比例"""
+        return self._zoom_base * self.ZOOM_FACTOR ** self._zoom_step
+    
+    @pyqtSlot()
     def _zoom_in(self):
         """放大图像"""
-        if hasattr(self, 'original_pixmap') and self.original_pixmap is not None:
-            self.current_scale *= 1.2
-            self._update_scaled_image()
+        if self._diagram_path is not None and self.current_scale * self.ZOOM_FACTOR <= self.MAX_SCALE:
+            self._zoom_step += 1
+            self._throttled_zoom()
     
+    @pyqtSlot()
     def _zoom_out(self):
         """缩小图像"""
-        if hasattr(self, 'original_pixmap') and self.original_pixmap is not None:
-            self.current_scale *= 0.8
-            self._update_scaled_image()
+        if self._diagram_path is not None and self.current_scale / self.ZOOM_FACTOR >= self.MIN_SCALE:
+            self._zoom_step -= 1
+            self._throttled_zoom()
     
+    @pyqtSlot()
     def _reset_zoom(self):
         """重置缩放"""
-        if hasattr(self, 'original_pixmap') and self.original_pixmap is not None:
-            self.current_scale = 1.0
-            self._update_scaled_image()
-    
-    def _update_scaled_image(self):
-        """更新缩放后的图像"""
-        if hasattr(self, 'original_pixmap') and self.original_pixmap is not None:
-            # 使用高质量缩放
+        if self._diagram_path is not None:
+            self._zoom_base = 1.0
+            self._zoom_step = 0
+            self._throttled_zoom()
+    
+    def _get_scaled_pixmap(self, cached_only: bool = False) -> Optional[QPixmap]:
+        """
+        获取当前缩放比例下平滑缩放的图像，同一尺寸只缩放一次
+        
+        Args:
+            cached_only: 为True时只查缓存，未命中返回None
+            
+        Returns:
+            Optional[QPixmap]: 缩放后的图像
+        """
+        scale = self.current_scale
+        if scale == 1.0:
+            return self.original_pixmap
+        
+        size = (int(self._original_size.width() * scale),
+                int(self._original_size.height() * scale))
+        scaled_pixmap = self._scaled_cache.get(size)
+        if scaled_pixmap is not None:
+            self._scaled_cache.move_to_end(size)
+            return scaled_pixmap
+        
+        if cached_only:
+            return None
+        
+        # 使用高质量缩放
+        scaled_pixmap = self.original_pixmap.scaled(
+            size[0],
+            size[1],
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation  # 使用平滑变换提高质量
+        )
+        self._cache_scaled_pixmap(size, scaled_pixmap)
+        return scaled_pixmap
+    
+    def _cache_scaled_pixmap(self, size, pixmap: QPixmap):
+        """
+        缓存缩放结果，按条目数和总像素数淘汰最久未使用的缩放结果，至少保留当前这一张
+        
+        Args:
+            size: 缩放后的尺寸 (宽, 高)
+            pixmap: 缩放后的图像
+        """
+        self._scaled_cache[size] = pixmap
+        self._scaled_cache_pixels += size[0] * size[1]
+        
+        while len(self._scaled_cache) > 1 and (len(self._scaled_cache) > self.SCALED_CACHE_SIZE
+                                               or self._scaled_cache_pixels > self.SCALED_CACHE_PIXELS):
+            (width, height), _ = self._scaled_cache.popitem(last=False)
+            self._scaled_cache_pixels -= width * height
+    
+    def _clear_scaled_cache(self):
+        """清空缩放结果缓存"""
+        self._smooth_timer.stop()
+        self._scaled_cache.clear()
+        self._scaled_cache_pixels = 0
+    
+    def _update_scaled_image(self, fast: bool = False, log: bool = True):
+        """
+        更新缩放后的图像
+        
+        Args:
+            fast: 是否先显示快速缩放的结果，并在停止缩放后再平滑缩放
+            log: 是否记录缩放日志
+        """
+        self._smooth_timer.stop()
+        if self._diagram_path is None:
+            return
+        
+        scaled_pixmap = self._get_scaled_pixmap(cached_only=fast)
+        if scaled_pixmap is None:
+            # 缓存未命中时先用快速缩放响应点击，平滑缩放推迟到停止点击之后
             scaled_pixmap = self.original_pixmap.scaled(
                 int(self.original_pixmap.width() * self.current_scale),
                 int(self.original_pixmap.height() * self.current_scale),
                 Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation  # 使用平滑变换提高质量
+                Qt.TransformationMode.FastTransformation
             )
-            self.diagram_image = scaled_pixmap
-            self.diagram_image_label.setPixmap(scaled_pixmap)
-            logger.info(f"图像已缩放，当前比例: {self.current_scale:.2f}")
+            self._smooth_timer.start()
+        
+        self.diagram_image = scaled_pixmap
+        self.diagram_image_label.setPixmap(scaled_pixmap)
+        if log:
+            logger.info("图像已缩放，当前比例: %.2f", self.current_scale)
     
     def has_architecture(self) -> bool:
         """
@@ -514,12 +1221,15 @@ class OutputPanel(QWidget):
         """
         return self.diagram_image is not None
     
-    def save_architecture(self, file_path: str):
+    def get_architecture_file_content(self, file_path: str) -> Union[str, bytes]:
         """
-        保存架构设计到文件
+        生成保存架构设计所需的文件内容
         
         Args:
-            file_path: 文件路径
+            file_path: 文件路径，根据扩展名决定格式
+            
+        Returns:
+            Union[str, bytes]: 文件内容，JSON格式为已编码的字节
         """
         if not self.architecture_data:
             raise ValueError("没有可保存的架构设计数据")
@@ -528,52 +1238,80 @@ class OutputPanel(QWidget):
         _, ext = os.path.splitext(file_path)
         
         if ext.lower() == ".json":
-            # 保存为JSON格式
-            with open(file_path, "w", encoding="utf-8") as f:
-                json.dump(self.architecture_data, f, ensure_ascii=False, indent=2)
+            # 保存为JSON格式，直接生成字节写入文件
+            return self._get_architecture_json()
         elif ext.lower() == ".mmd":
             # 保存为Mermaid格式
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(self.mermaid_editor.toPlainText())
+            return self.mermaid_editor.toPlainText()
+        
+        # 默认保存为Markdown格式
+        lines = ["# 架构设计方案\n\n"]
+        
+        # 架构概述
+        if "architecture_overview" in self.architecture_data:
+            lines.append("## 架构概述\n\n")
+            lines.append(f"{self.architecture_data['architecture_overview']}\n\n")
+        
+        # 架构组件
+        if "components" in self.architecture_data:
+            lines.append("## 架构组件\n\n")
+            lines.extend(
+                _COMPONENT_MD(component.get('name', ''), component.get('service_type', ''), component.get('description', ''))
+                for component in self.architecture_data["components"]
+            )
+        
+        # 设计决策
+        if "design_decisions" in self.architecture_data:
+            lines.append("## 设计决策\n\n")
+            lines.extend(_NUMBERED_MD(i, decision)
+                         for i, decision in enumerate(self.architecture_data["design_decisions"], 1))
+            lines.append("\n")
+        
+        # 最佳实践
+        if "best_practices" in self.architecture_data:
+            lines.append("## 应用的AWS最佳实践\n\n")
+            lines.extend(_NUMBERED_MD(i, practice)
+                         for i, practice in enumerate(self.architecture_data["best_practices"], 1))
+        
+        # 添加Mermaid图表
+        lines.append("\n## 架构图\n\n")
+        lines.append("```mermaid\n")
+        lines.append(self.mermaid_editor.toPlainText())
+        lines.append("\n```\n")
+        
+        return "".join(lines)
+    
+    def save_architecture(self, file_path: str):
+        """
+        保存架构设计到文件
+        
+        Args:
+            file_path: 文件路径
+        """
+        content = self.get_architecture_file_content(file_path)
+        if isinstance(content, bytes):
+            with open(file_path, "wb", buffering=1024 * 1024) as f:
+                f.write(content)
         else:
-            # 默认保存为Markdown格式
             with open(file_path, "w", encoding="utf-8") as f:
-                f.write("# 架构设计方案\n\n")
-                
-                # 架构概述
-                if "architecture_overview" in self.architecture_data:
-                    f.write("## 架构概述\n\n")
-                    f.write(f"{self.architecture_data['architecture_overview']}\n\n")
-                
-                # 架构组件
-                if "components" in self.architecture_data:
-                    f.write("## 架构组件\n\n")
-                    for component in self.architecture_data["components"]:
-                        f.write(f"### {component.get('name', '')}\n\n")
-                        f.write(f"- **服务类型**: {component.get('service_type', '')}\n")
-                        f.write(f"- **描述**: {component.get('description', '')}\n\n")
-                
-                # 设计决策
-                if "design_decisions" in self.architecture_data:
-                    f.write("## 设计决策\n\n")
-                    for i, decision in enumerate(self.architecture_data["design_decisions"], 1):
-                        f.write(f"{i}. {decision}\n")
-                    f.write("\n")
-                
-                # 最佳实践
-                if "best_practices" in self.architecture_data:
-                    f.write("## 应用的AWS最佳实践\n\n")
-                    for i, practice in enumerate(self.architecture_data["best_practices"], 1):
-                        f.write(f"{i}. {practice}\n")
-                
-                # 添加Mermaid图表
-                f.write("\n## 架构图\n\n")
-                f.write("```mermaid\n")
-                f.write(self.mermaid_editor.toPlainText())
-                f.write("\n```\n")
+                f.write(content)
         
         logger.info(f"架构设计已保存到: {file_path}")
     
+    def get_diagram_export_image(self) -> QImage:
+        """
+        获取用于导出的架构图图像（QImage可以在后台线程中保存）
+        
+        Returns:
+            QImage: 架构图图像，使用原始图像以保持高分辨率
+        """
+        if not self.diagram_image:
+            raise ValueError("没有可导出的架构图")
+        
+        if self._diagram_path is not None:
+            return self.original_pixmap.toImage()
+        return self.diagram_image.toImage()
+    
     def export_diagram(self, file_path: str):
         """
         导出架构图
@@ -591,43 +1329,173 @@ class OutputPanel(QWidget):
             logger.info(f"Mermaid图表已导出到: {file_path}")
         else:
             # 导出为图片格式
-            if not self.diagram_image:
-                raise ValueError("没有可导出的架构图")
-            
-            # 保存图片，使用原始图像以保持高分辨率
-            if self.original_pixmap:
-                self.original_pixmap.save(file_path, quality=100)  # 使用最高质量设置
-            else:
-                self.diagram_image.save(file_path, quality=100)
+            self.get_diagram_export_image().save(file_path, quality=100)  # 使用最高质量设置
             logger.info(f"架构图已导出到: {file_path}")
             
     def _on_mermaid_text_changed(self):
         """处理Mermaid编辑器文本变化事件，实现实时预览"""
         if self.auto_preview:
-            # 使用延迟计时器，避免频繁更新
-            from PyQt6.QtCore import QTimer
-            if hasattr(self, '_preview_timer'):
-                self._preview_timer.stop()
-            else:
-                self._preview_timer = QTimer()
-                self._preview_timer.setSingleShot(True)
-                self._preview_timer.timeout.connect(self._preview_mermaid)
-            
-            # 设置500毫秒延迟，减少频繁渲染
-            self._preview_timer.start(500)
+            # 使用延迟计时器，重新开始计时，减少频繁渲染
+            self._preview_timer.start()
             
             # 更新状态指示器
-            self.preview_status.setText("编辑中...")
-            self.preview_status.setStyleSheet("color: orange;")
+            self._set_preview_status("编辑中...", "color: orange;")
     
-    def _on_preview_load_finished(self, success):
-        """处理预览加载完成事件"""
-        if success:
-            self.preview_status.setText("预览已更新")
-            self.preview_status.setStyleSheet("color: green;")
+    def _render_with_mmdc(self, mermaid_code: str, key: str):
+        """
+        使用mermaid-cli异步渲染SVG，已渲染过的源码直接读取磁盘缓存
+        
+        Args:
+            mermaid_code: Mermaid源码
+            key: 源码键
+        """
+        # 中间文件和SVG都放在缓存目录中，目录不可用时无法渲染
+        if not ensure_cache_dir(_MERMAID_SVG_CACHE_DIR):
+            self._rendering_mermaid_key = None
+            self._last_mermaid_key = None
+            self._set_preview_status("预览渲染失败", "color: red;")
+            return
+        
+        svg_path = os.path.join(_MERMAID_SVG_CACHE_DIR, key + ".svg")
+        if os.path.exists(svg_path):
+            self._rendering_mermaid_key = None
+            touch_cache_file(svg_path)
+            self.mermaid_preview.load(svg_path)
+            self._set_preview_status("预览已更新", "color: green;")
+            return
+        
+        # 同一时间只保留最新的渲染进程，旧进程直接终止，不会产生输出，也不会写入缓存
+        if self._mmdc_process is not None:
+            self._mmdc_process.kill()
+            self._mmdc_process = None
+        
+        # 每次渲染使用各自的中间文件，被终止的进程不会影响新的渲染
+        self._mmdc_run += 1
+        file_prefix = os.path.join(_MERMAID_SVG_CACHE_DIR, f"{key}.{self._mmdc_run}")
+        try:
+            source_path = file_prefix + ".mmd"
+            with open(source_path, "w", encoding="utf-8") as f:
+                f.write(mermaid_code)
+        except OSError as e:
+            logger.error(f"写入Mermaid源码失败: {str(e)}")
+            self._last_mermaid_key = None
+            self._set_preview_status("预览渲染失败", "color: red;")
+            return
+        
+        # 先输出到临时文件，渲染成功后再放入缓存，避免缓存不完整的SVG
+        output_path = file_prefix + ".tmp.svg"
+        process = QProcess(self)
+        process.finished.connect(partial(self._on_mmdc_finished, process, key, source_path, output_path, svg_path))
+        self._mmdc_process = process
+        self._rendering_mermaid_key = key
+        self._set_preview_status("渲染中...", "color: gray; font-style: italic;")
+        process.start(self._mmdc_path, ["-i", source_path, "-o", output_path])
+    
+    def _on_mmdc_finished(self, process: QProcess, key: str, source_path: str, output_path: str,
+                          svg_path: str, exit_code: int, exit_status: QProcess.ExitStatus):
+        """
+        mermaid-cli渲染结束，成功时放入缓存并显示
+        
+        Args:
+            process: 渲染进程
+            key: 源码键
+            source_path: Mermaid源码文件
+            output_path: 渲染输出的临时文件
+            svg_path: 缓存的SVG文件
+            exit_code: 进程退出码
+            exit_status: 进程退出状态
+        """
+        is_current = process is self._mmdc_process
+        if is_current:
+            self._mmdc_process = None
+        error_output = bytes(process.readAllStandardError()).decode("utf-8", errors="replace").strip()
+        process.deleteLater()
+        
+        success = exit_status == QProcess.ExitStatus.NormalExit and exit_code == 0 and os.path.exists(output_path)
+        try:
+            if success:
+                os.replace(output_path, svg_path)
+                prune_cache_dir(_MERMAID_SVG_CACHE_DIR, ".svg",
+                                _MERMAID_SVG_CACHE_MAX_ENTRIES, _MERMAID_SVG_CACHE_MAX_BYTES)
+            for path in (source_path, output_path):
+                if os.path.exists(path):
+                    os.remove(path)
+        except OSError as e:
+            logger.warning(f"整理Mermaid渲染文件失败: {str(e)}")
+        
+        # 进程已被新的渲染或清空操作终止，上面只清理了它的中间文件
+        if not is_current:
+            return
+        self._rendering_mermaid_key = None
+        
+        if success and os.path.exists(svg_path):
+            self.mermaid_preview.load(svg_path)
+            self._set_preview_status("预览已更新", "color: green;")
         else:
-            self.preview_status.setText("预览加载失败")
-            self.preview_status.setStyleSheet("color: red;")
+            logger.error(f"mermaid-cli渲染失败: {error_output}")
+            self._set_preview_status("预览渲染失败", "color: red;")
+    
+    def _set_preview_status(self, text: str, style: str):
+        """
+        更新预览状态指示器，样式未变化时不重新设置样式表，避免每次按键都重新解析样式
+        
+        Args:
+            text: 状态文本
+            style: 样式表
+        """
+        if self.preview_status.text() != text:
+            self.preview_status.setText(text)
+        if self.preview_status.styleSheet() != style:
+            self.preview_status.setStyleSheet(style)
+    
+    def _on_preview_load_finished(self, success):
+        """处理预览页面加载完成事件，预览页面只在启动或重新加载时加载"""
+        self._mermaid_ready = success
+        self._last_mermaid_key = None
+        self._rendering_mermaid_key = None
+        if not success:
+            self._set_preview_status("预览加载失败", "color: red;")
+            return
+        
+        self._set_preview_status("预览已更新", "color: green;")
+        if self._mermaid_preview_pending:
+            self._mermaid_preview_pending = False
+            self._preview_mermaid()
+    
+    def _on_preview_title_changed(self, title: str):
+        """
+        预览页面标题变化，渲染结束时更新状态，渲染成功时取回SVG放入缓存
+        
+        Args:
+            title: 页面标题，格式为"状态:源码键:序号"
+        """
+        parts = title.split(":")
+        if len(parts) != 3 or parts[1] != self._rendering_mermaid_key:
+            return
+        state, key, _ = parts
+        self._rendering_mermaid_key = None
+        
+        if state == "failed":
+            self._set_preview_status("预览渲染失败", "color: red;")
+            return
+        
+        self._set_preview_status("预览已更新", "color: green;")
+        self.mermaid_preview.page().runJavaScript("window.lastSvg", partial(self._store_mermaid_svg, key))
+    
+    def _store_mermaid_svg(self, key: str, svg):
+        """
+        缓存渲染出的SVG，超出数量上限时淘汰最久未使用的条目
+        
+        Args:
+            key: Mermaid源码键
+            svg: SVG文本，渲染失败时为None
+        """
+        if not svg:
+            return
+        self._mermaid_svg_cache[key] = svg
+        self._mermaid_svg_cache.move_to_end(key)
+        if len(self._mermaid_svg_cache) > self.MERMAID_CACHE_SIZE:
+            self._mermaid_svg_cache.popitem(last=False)
     
     def _toggle_auto_preview(self):
         """切换自动预览状态"""
@@ -653,126 +1521,52 @@ class OutputPanel(QWidget):
         connections = []
         
         try:
-            # 解析Mermaid代码
-            lines = mermaid_code.strip().split('\n')
-            logger.info(f"开始解析Mermaid代码，共{len(lines)}行")
-            
-            # 解析节点
-            for line in lines:
-                line = line.strip()
+            # 一次扫描整个代码，根据匹配到的分组区分连接和各形状的节点
+            debug = logger.isEnabledFor(logging.DEBUG)
+            for match in _MERMAID_LINE_PATTERN.finditer(mermaid_code):
+                shape = match.lastgroup
                 
-                # 跳过空行、图表定义行、样式定义行和连接行
-                if not line or line.startswith("graph") or line.startswith("classDef") or line.startswith("class") or "-->" in line:
-                    continue
-                
-                # 解析矩形节点 [内容]
-                if "[" in line and "]" in line and not "(" in line:
-                    # 提取节点ID和内容
-                    parts = line.split("[", 1)
-                    node_id = parts[0].strip()
-                    content = parts[1].split("]")[0]
-                    
-                    # 处理节点内容，分离名称和类型
-                    if "<br/>" in content:
-                        name_parts = content.split("<br/>")
-                        node_name = name_parts[0].strip()
-                        node_type = name_parts[1].strip()
-                    else:
-                        node_name = content.strip()
-                        node_type = "Generic"
-                    
-                    # 添加节点
-                    nodes.append({
-                        "id": node_id,
-                        "name": node_name,
-                        "type": node_type
-                    })
-                    logger.info(f"解析到矩形节点: ID={node_id}, 名称={node_name}, 类型={node_type}")
-                
-                # 解析圆柱形节点 [(内容)]
-                elif "[(" in line and ")]" in line:
-                    parts = line.split("[(", 1)
-                    node_id = parts[0].strip()
-                    content = parts[1].split(")]")[0]
-                    
-                    if "<br/>" in content:
-                        name_parts = content.split("<br/>")
-                        node_name = name_parts[0].strip()
-                        node_type = name_parts[1].strip()
-                    else:
-                        node_name = content.strip()
-                        node_type = "Database"
-                    
-                    nodes.append({
-                        "id": node_id,
-                        "name": node_name,
-                        "type": node_type
-                    })
-                    logger.info(f"解析到圆柱形节点: ID={node_id}, 名称={node_name}, 类型={node_type}")
-                
-                # 解析菱形节点 {内容}
-                elif "{" in line and "}" in line:
-                    parts = line.split("{", 1)
-                    node_id = parts[0].strip()
-                    content = parts[1].split("}")[0]
-                    
-                    if "<br/>" in content:
-                        name_parts = content.split("<br/>")
-                        node_name = name_parts[0].strip()
-                        node_type = name_parts[1].strip()
-                    else:
-                        node_name = content.strip()
-                        node_type = "APIGateway"
-                    
-                    nodes.append({
-                        "id": node_id,
-                        "name": node_name,
-                        "type": node_type
-                    })
-                    logger.info(f"解析到菱形节点: ID={node_id}, 名称={node_name}, 类型={node_type}")
-            
-            # 解析连接
-            for line in lines:
-                line = line.strip()
-                
-                # 只处理连接行
-                if "-->" in line:
-                    parts = line.split("-->")
-                    from_id = parts[0].strip()
-                    
-                    # 处理带标签的连接
-                    if "|" in parts[1]:
-                        label_parts = parts[1].split("|")
-                        if len(label_parts) >= 3:  # 确保格式是 from -->|label| to
-                            label = label_parts[1].strip()
-                            to_id = label_parts[2].strip()
-                        else:
-                            to_id = label_parts[-1].strip()
-                            label = label_parts[0].strip() if len(label_parts) > 1 else ""
-                    else:
-                        to_id = parts[1].strip()
-                        label = ""
-                    
-                    # 添加连接
+                if match.group("src") is not None:
+                    from_id = match.group("src").strip()
+                    to_id = match.group("dst").strip()
+                    label = (match.group("label") or "").strip()
                     connections.append({
                         "from": from_id,
                         "to": to_id,
                         "label": label
                     })
-                    logger.info(f"解析到连接: {from_id} --> {to_id} (标签: {label})")
+                    if debug:
+                        logger.debug(f"解析到连接: {from_id} --> {to_id} (标签: {label})")
+                    continue
+                
+                # 处理节点内容，分离名称和类型
+                node_id = match.group(f"{shape}_id").strip()
+                name_parts = _MERMAID_BR_PATTERN.split(match.group(shape))
+                node_name = name_parts[0].strip()
+                node_type = name_parts[1].strip() if len(name_parts) > 1 else _MERMAID_DEFAULT_TYPES[shape]
+                
+                nodes.append({
+                    "id": node_id,
+                    "name": node_name,
+                    "type": node_type
+                })
+                if debug:
+                    logger.debug(f"解析到节点: ID={node_id}, 名称={node_name}, 类型={node_type}, 形状={shape}")
+            
+            logger.info(f"Mermaid代码解析完成: {len(nodes)}个节点, {len(connections)}个连接")
             
-            # 处理特殊连接目标"all"
+            # 处理特殊连接目标"all"，节点ID列表只计算一次
+            node_ids = [node["id"] for node in nodes]
             all_connections = []
             for conn in connections:
                 if conn["to"] == "all":
-                    # 为每个节点创建一个连接
-                    for node in nodes:
-                        if node["id"] != conn["from"]:  # 避免自连接
-                            all_connections.append({
-                                "from": conn["from"],
-                                "to": node["id"],
-                                "label": conn["label"]
-                            })
+                    # 为每个节点创建一个连接，避免自连接
+                    from_id = conn["from"]
+                    label = conn["label"]
+                    all_connections.extend(
+                        {"from": from_id, "to": node_id, "label": label}
+                        for node_id in node_ids if node_id != from_id
+                    )
                 else:
                     all_connections.append(conn)
             
@@ -804,14 +1598,12 @@ class OutputPanel(QWidget):
         Returns:
             str: 清理后的节点ID
         """
-        # 移除各种括号和空格
-        for char in ["[", "]", "(", ")", "{", "}", ">", " "]:
-            if char in node_id:
-                node_id = node_id.split(char)[0]
+        # 截取第一个括号或空格之前的部分
+        cleaned_id = node_id.translate(_NODE_ID_CLEAN_TABLE).split(_NODE_ID_SEPARATOR, 1)[0].strip()
         
-        # 记录清理过程
-        logger.debug(f"清理节点ID: 原始={node_id} -> 清理后={node_id.strip()}")
-        return node_id.strip()
+        # 记录清理过程，日志参数在输出时才格式化
+        logger.debug("清理节点ID: 原始=%s -> 清理后=%s", node_id, cleaned_id)
+        return cleaned_id
         
     def _create_architecture_data(self, nodes, connections):
         """
@@ -876,63 +1668,40 @@ class OutputPanel(QWidget):
             return
         
         try:
-            # 显示生成中的提示
-            self.diagram_image_label.setText("正在从Mermaid代码生成架构图...")
-            
-            # 解析Mermaid代码生成架构数据
-            architecture_data = self._parse_mermaid_to_architecture_data(mermaid_code)
-            if not architecture_data:
-                raise ValueError("解析Mermaid代码失败，无法生成架构数据")
-            
-            # 记录生成的数据结构，便于调试
-            nodes_count = len(architecture_data.get('diagram_description', {}).get('nodes', []))
-            connections_count = len(architecture_data.get('diagram_description', {}).get('connections', []))
-            logger.info(f"从Mermaid生成的架构数据: 节点数={nodes_count}, 连接数={connections_count}")
-            
-            # 使用架构数据更新UI
-            self.architecture_data = architecture_data
-            
-            # 显示架构概述
-            self.overview_tab.setHtml("<h3>架构概述</h3><p>{0}</p>".format(
-                architecture_data['architecture_overview']))
+            # 解析Mermaid代码生成架构数据，代码未变化时沿用上次解析的结果
+            mermaid_hash = hashlib.blake2b(mermaid_code.encode("utf-8"), digest_size=16).digest()
+            if self._parsed_mermaid is not None and self._parsed_mermaid[0] == mermaid_hash:
+                logger.info("Mermaid代码未变化，沿用上次解析的架构数据")
+                architecture_data = self._parsed_mermaid[1]
+            else:
+                architecture_data = self._parse_mermaid_to_architecture_data(mermaid_code)
+                if not architecture_data:
+                    raise ValueError("解析Mermaid代码失败，无法生成架构数据")
+                self._parsed_mermaid = (mermaid_hash, architecture_data)
             
-            # 显示架构组件
-            components_html = "<h3>架构组件</h3><ul>"
-            for component in architecture_data["components"]:
-                name = component.get('name', '')
-                service_type = component.get('service_type', '')
-                description = component.get('description', '')
-                components_html += "<li><b>{0}</b> ({1}): {2}</li>".format(
-                    name, service_type, description)
-            components_html += "</ul>"
-            self.components_tab.setHtml(components_html)
-            
-            # 显示原始JSON
-            self.json_tab.setText(json.dumps(architecture_data, ensure_ascii=False, indent=2))
+            # 架构图改为来自Mermaid代码
+            self._architecture_key = None
             
-            # 生成并显示架构图
-            try:
-                logger.info("开始生成架构图")
-                diagram_path = self.diagram_generator.generate_diagram(architecture_data)
-                self._display_diagram(diagram_path)
+            # 使用架构数据更新UI，已显示的是同一份数据时文本选项卡和JSON无需更新
+            if architecture_data is not self.architecture_data:
+                self.architecture_data = architecture_data
+                self._architecture_json = None
+                
+                # 显示架构概述
+                self._set_text_tab("overview", _OVERVIEW_HTML(_escape_html(architecture_data['architecture_overview'])))
                 
-                # 添加成功消息
-                QMessageBox.information(
-                    self,
-                    "生成成功",
-                    "已成功从Mermaid代码生成架构图并更新所有相关面板。"
-                )
+                # 显示架构组件
+                self._set_text_tab("components", partial(self._write_components, architecture_data["components"]),
+                                   is_html=None)
                 
-                # 切换到架构图选项卡
-                self.tab_widget.setCurrentIndex(2)  # 架构图是第三个选项卡（索引为2）
-            except Exception as e:
-                logger.error(f"生成架构图失败: {str(e)}")
-                self.diagram_image_label.setText(f"生成架构图失败: {str(e)}")
-                QMessageBox.warning(
-                    self,
-                    "生成图片失败",
-                    f"生成架构图失败: {str(e)}\n\n请检查Graphviz是否正确安装。"
-                )
+                # 显示原始JSON，在后台序列化
+                self._start_json_task()
+            
+            # 在线程池中生成架构图，完成后显示结果，生成期间不阻塞界面
+            diagram_description = architecture_data["diagram_description"]
+            logger.info("从Mermaid生成的架构数据: 节点数=%d, 连接数=%d，开始生成架构图",
+                        len(diagram_description["nodes"]), len(diagram_description["connections"]))
+            self._start_diagram_task(architecture_data, None, from_mermaid=True)
             
         except Exception as e:
             logger.error(f"从Mermaid代码生成图表失败: {str(e)}")
@@ -943,21 +1712,66 @@ class OutputPanel(QWidget):
                 f"从Mermaid代码解析架构数据失败: {str(e)}\n\n请检查Mermaid代码格式是否正确。"
             )
     
+    def reset(self):
+        """重置输出面板，清空所有选项卡内容，暂停重绘和信号以便只刷新一次"""
+        self.architecture_data = None
+        self._architecture_json = None
+        self._json_task_id += 1
+        self._architecture_key = None
+        self._diagram_key = None
+        self._diagram_task_id += 1
+        self.diagram_image = None
+        self._diagram_path = None
+        self._original_size = None
+        self._original_pixmap = None
+        self._zoom_base = 1.0
+        self._zoom_step = 0
+        self._clear_scaled_cache()
+        
+        # 尚未创建或尚未填充的选项卡只需丢弃待显示的内容
+        self._text_tab_content.clear()
+        self._stale_text_tabs.clear()
+        widgets = [self] + list(self._text_tabs.values()) + [self.mermaid_editor]
+        
+        self.setUpdatesEnabled(False)
+        try:
+            for widget in widgets:
+                widget.blockSignals(True)
+            
+            for text_edit in self._text_tabs.values():
+                text_edit.clear()
+            self.diagram_image_label.setText("尚未生成架构图")
+            self.clear_mermaid()
+        finally:
+            for widget in widgets:
+                widget.blockSignals(False)
+            self.setUpdatesEnabled(True)
+            self.update()
+    
     def clear_mermaid(self):
         """清空Mermaid编辑器和预览"""
-        if hasattr(self, 'mermaid_editor'):
-            self.mermaid_editor.clear()
+        self.mermaid_editor.clear()
         
-        if hasattr(self, 'mermaid_preview'):
-            # 清空预览，显示空白页面
-            self.mermaid_preview.setHtml("<html><body><p>尚未生成架构图</p></body></html>")
+        # 清空预览，在页面内显示空白提示，不重新加载页面
+        self._last_mermaid_key = None
+        self._rendering_mermaid_key = None
+        self._mermaid_preview_pending = False
+        if self._mmdc_path:
+            if self._mmdc_process is not None:
+                self._mmdc_process.kill()
+                self._mmdc_process = None
+            self.mermaid_preview.load(QByteArray())
+        elif self._mermaid_ready:
+            self.mermaid_preview.page().runJavaScript("clearPreview()")
             
     def resizeEvent(self, event):
-        """处理窗口大小变化事件，更新分割器大小"""
+        """处理窗口大小变化事件，延迟更新分割器大小"""
         super().resizeEvent(event)
-        # 如果存在mermaid分割器，保持其比例
-        if hasattr(self, 'mermaid_splitter'):
-            # 获取当前总高度
-            total_height = self.mermaid_tab.height()
-            # 保持编辑区和预览区的比例约为40:60
-            self.mermaid_splitter.setSizes([int(total_height * 0.4), int(total_height * 0.6)])
\ No newline at end of file
+        self._resize_timer.start()
+    
+    def _apply_splitter_sizes(self):
+        """按比例更新mermaid分割器大小"""
+        # 保持mermaid分割器的比例，获取当前总高度
+        total_height = self.mermaid_tab.height()
+        # 保持编辑区和预览区的比例约为40:60
+        self.mermaid_splitter.setSizes([int(total_height * 0.4), int(total_height * 0.6)])
\ No newline at end of file
@@ -9,18 +9,31 @@
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                            QPushButton, QListWidget, QListWidgetItem,
                            QInputDialog, QMessageBox, QMenu)
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QSignalBlocker
 from PyQt6.QtGui import QIcon, QAction
 
-import logging
-from datetime import datetime
+import time
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 
 from src.core.session_manager import SessionManager, Session
+from src.utils.logger import get_logger
 
-# 配置日志
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-logger = logging.getLogger(__name__)
+# 获取日志记录器
+logger = get_logger(__name__)
+
+@lru_cache(maxsize=1024)
+def _format_created_minute(minute: int) -> str:
+    """
+    格式化会话创建时间，按分钟缓存格式化结果
+    
+    Args:
+        minute: 创建时间戳对应的分钟数（时间戳 // 60）
+        
+    Returns:
+        str: 格式化后的时间
+    """
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(minute * 60))
 
 class SessionPanel(QWidget):
     """会话面板，用于管理会话"""
@@ -41,6 +54,11 @@ class SessionPanel(QWidget):
         # 保存会话管理器
         self.session_manager = session_manager
         
+        # 会话ID -> 列表行号，查找会话项时无需逐项访问列表
+        self._id_to_row = {}
+        # 按行排列的列表项，刷新时复用已有会话的列表项
+        self._session_items = []
+        
         # 创建UI组件
         self._create_ui()
         
@@ -60,11 +78,23 @@ class SessionPanel(QWidget):
         
         # 创建会话列表
         self.session_list = QListWidget()
+        # 所有会话项都是两行文本，统一尺寸后布局时无需逐项测量
+        self.session_list.setUniformItemSizes(True)
         self.session_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.session_list.customContextMenuRequested.connect(self._show_context_menu)
         self.session_list.itemClicked.connect(self._on_session_clicked)
         main_layout.addWidget(self.session_list)
         
+        # 会话项的上下文菜单只创建一次，显示时记录目标会话
+        self._context_session_id = None
+        self._context_menu = QMenu(self)
+        rename_action = QAction("重命名", self)
+        rename_action.triggered.connect(self._on_rename_action)
+        self._context_menu.addAction(rename_action)
+        delete_action = QAction("删除", self)
+        delete_action.triggered.connect(self._on_delete_action)
+        self._context_menu.addAction(delete_action)
+        
         # 创建底部按钮布局
         button_layout = QHBoxLayout()
         
@@ -78,27 +108,49 @@ class SessionPanel(QWidget):
     
     def _load_sessions(self):
         """加载会话列表"""
-        # 清空列表
-        self.session_list.clear()
-        
-        # 获取所有会话
-        sessions = self.session_manager.get_all_sessions()
-        
-        # 添加到列表
-        for session_info in sessions:
-            self._add_session_to_list(session_info)
-        
-        # 如果有活动会话，选中它
-        active_session = self.session_manager.get_active_session()
-        if active_session:
-            self._select_session_in_list(active_session.session_id)
+        # 重建列表期间屏蔽信号并暂停重绘，避免触发多余的选择处理和逐项重绘
+        blocker = QSignalBlocker(self.session_list)
+        self.session_list.setUpdatesEnabled(False)
+        try:
+            # 获取所有会话，已有会话复用原列表项并只在文本变化时更新
+            sessions = self.session_manager.get_all_sessions()
+            session_ids = [session_info["session_id"] for session_info in sessions]
+            old_items = dict(zip(self._id_to_row, self._session_items))
+            items = []
+            for session_info in sessions:
+                item = old_items.get(session_info["session_id"])
+                if item is None:
+                    item = self._create_session_item(session_info)
+                else:
+                    self._update_session_item(item, session_info)
+                items.append(item)
+            
+            # 会话顺序或成员变化时取出全部列表项，再按新顺序加入
+            if session_ids != list(self._id_to_row):
+                for row in range(self.session_list.count() - 1, -1, -1):
+                    self.session_list.takeItem(row)
+                for item in items:
+                    self.session_list.addItem(item)
+            self._session_items = items
+            self._id_to_row = {session_id: row for row, session_id in enumerate(session_ids)}
+            
+            # 如果有活动会话，选中它
+            active_session = self.session_manager.get_active_session()
+            if active_session:
+                self._select_session_in_list(active_session.session_id)
+        finally:
+            self.session_list.setUpdatesEnabled(True)
+            blocker.unblock()
     
-    def _add_session_to_list(self, session_info: Dict[str, Any]):
+    def _create_session_item(self, session_info: Dict[str, Any]) -> QListWidgetItem:
         """
-        将会话添加到列表
+        创建会话列表项
         
         Args:
             session_info: 会话信息
+            
+        Returns:
+            QListWidgetItem: 列表项
         """
         # 创建列表项
         item = QListWidgetItem()
@@ -107,12 +159,50 @@ class SessionPanel(QWidget):
         item.setData(Qt.ItemDataRole.UserRole, session_info["session_id"])
         
         # 设置显示文本
-        created_time = datetime.fromtimestamp(session_info["created_at"]).strftime("%Y-%m-%d %H:%M")
-        display_text = f"{session_info['name']}\n{created_time} | {session_info['interaction_count']}次交互"
-        item.setText(display_text)
+        self._update_session_item(item, session_info)
+        return item
+    
+    def _update_session_item(self, item: QListWidgetItem, session_info: Dict[str, Any]):
+        """
+        更新会话列表项的显示文本，文本未变化时不做修改
+        
+        Args:
+            item: 列表项
+            session_info: 会话信息
+        """
+        display_text = self._format_session_text(
+            session_info["name"], session_info["created_at"], session_info["interaction_count"]
+        )
+        if item.text() != display_text:
+            item.setText(display_text)
+    
+    @staticmethod
+    def _format_session_text(name: str, created_at: float, interaction_count: int) -> str:
+        """
+        生成会话列表项的显示文本
+        
+        Args:
+            name: 会话名称
+            created_at: 创建时间戳
+            interaction_count: 交互次数
+            
+        Returns:
+            str: 显示文本
+        """
+        created_time = _format_created_minute(int(created_at) // 60)
+        return f"{name}\n{created_time} | {interaction_count}次交互"
+    
+    def _find_session_row(self, session_id: str) -> int:
+        """
+        查找会话在列表中的行号
         
-        # 添加到列表
-        self.session_list.addItem(item)
+        Args:
+            session_id: 会话ID
+            
+        Returns:
+            int: 行号，未找到时返回-1
+        """
+        return self._id_to_row.get(session_id, -1)
     
     def _select_session_in_list(self, session_id: str):
         """
@@ -121,13 +211,10 @@ class SessionPanel(QWidget):
         Args:
             session_id: 会话ID
         """
-        # 查找会话项
-        for i in range(self.session_list.count()):
-            item = self.session_list.item(i)
-            if item.data(Qt.ItemDataRole.UserRole) == session_id:
-                # 选中项
-                self.session_list.setCurrentItem(item)
-                break
+        # 查找并选中会话项
+        row = self._find_session_row(session_id)
+        if row >= 0:
+            self.session_list.setCurrentRow(row)
     
     def _on_session_clicked(self, item: QListWidgetItem):
         """
@@ -170,24 +257,19 @@ class SessionPanel(QWidget):
         if not item:
             return
         
-        # 获取会话ID
-        session_id = item.data(Qt.ItemDataRole.UserRole)
-        
-        # 创建上下文菜单
-        menu = QMenu(self)
-        
-        # 添加重命名操作
-        rename_action = QAction("重命名", self)
-        rename_action.triggered.connect(lambda: self._rename_session(session_id))
-        menu.addAction(rename_action)
-        
-        # 添加删除操作
-        delete_action = QAction("删除", self)
-        delete_action.triggered.connect(lambda: self._delete_session(session_id))
-        menu.addAction(delete_action)
-        
-        # 显示菜单
-        menu.exec(self.session_list.mapToGlobal(position))
+        # 记录目标会话并显示菜单
+        self._context_session_id = item.data(Qt.ItemDataRole.UserRole)
+        self._context_menu.exec(self.session_list.mapToGlobal(position))
+    
+    def _on_rename_action(self):
+        """上下文菜单的重命名操作"""
+        if self._context_session_id is not None:
+            self._rename_session(self._context_session_id)
+    
+    def _on_delete_action(self):
+        """上下文菜单的删除操作"""
+        if self._context_session_id is not None:
+            self._delete_session(self._context_session_id)
     
     def _rename_session(self, session_id: str):
         """
@@ -209,8 +291,14 @@ class SessionPanel(QWidget):
         if ok and new_name:
             # 重命名会话
             if self.session_manager.rename_session(session_id, new_name):
-                # 重新加载会话列表
-                self._load_sessions()
+                # 只更新对应的列表项，重命名不影响列表顺序
+                row = self._find_session_row(session_id)
+                if row >= 0:
+                    self.session_list.item(row).setText(self._format_session_text(
+                        session.name, session.created_at, len(session.interactions)
+                    ))
+                else:
+                    self._load_sessions()
     
     def _delete_session(self, session_id: str):
         """
@@ -229,8 +317,15 @@ class SessionPanel(QWidget):
         if reply == QMessageBox.StandardButton.Yes:
             # 删除会话
             if self.session_manager.delete_session(session_id):
-                # 重新加载会话列表
-                self._load_sessions()
+                # 只移除对应的列表项
+                row = self._id_to_row.pop(session_id, -1)
+                if row >= 0:
+                    self.session_list.takeItem(row)
+                    del self._session_items[row]
+                    # 后面的会话行号前移一行
+                    for other_id, other_row in self._id_to_row.items():
+                        if other_row > row:
+                            self._id_to_row[other_id] = other_row - 1
     
     def refresh(self):
         """刷新会话列表"""
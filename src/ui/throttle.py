@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+界面更新节流模块
+将高频的界面更新调用合并，避免每次调用都触发重绘
+"""
+
+from PyQt6.QtCore import QTimer
+
+
+class ThrottledCallable:
+    """节流调用包装：首次调用立即执行，间隔内的后续调用只保留最后一次，在间隔结束时执行"""
+
+    def __init__(self, func, timeout: int):
+        """
+        初始化节流调用
+
+        Args:
+            func: 被包装的函数
+            timeout: 节流间隔（毫秒）
+        """
+        self._func = func
+        self._pending = None
+
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(timeout)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def __call__(self, *args, **kwargs):
+        """调用被包装的函数，间隔内的调用会被合并"""
+        if self._timer.isActive():
+            self._pending = (args, kwargs)
+            return
+
+        self._func(*args, **kwargs)
+        self._timer.start()
+
+    def _on_timeout(self):
+        """间隔结束，执行最后一次被合并的调用"""
+        if self._pending is None:
+            return
+
+        args, kwargs = self._pending
+        self._pending = None
+        self._func(*args, **kwargs)
+        self._timer.start()
+
+
+def qthrottled(func, timeout: int = 30) -> ThrottledCallable:
+    """
+    创建节流调用
+
+    Args:
+        func: 被包装的函数
+        timeout: 节流间隔（毫秒）
+
+    Returns:
+        ThrottledCallable: 节流后的可调用对象
+    """
+    return ThrottledCallable(func, timeout)
@@ -8,12 +8,20 @@
 
 import os
 import json
+from pathlib import Path
 from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 
 # 加载环境变量
 load_dotenv()
 
+# 项目根目录和资源目录路径只依赖本文件位置，在导入时计算一次
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_RESOURCES_PATH = str(_PROJECT_ROOT / "resources")
+_TEMPLATES_PATH = str(_PROJECT_ROOT / "resources" / "templates")
+_ICONS_PATH = str(_PROJECT_ROOT / "resources" / "icons")
+_AWS_PATTERNS_PATH = str(_PROJECT_ROOT / "resources" / "aws_patterns")
+
 class Config:
     """配置管理类"""
     
@@ -61,7 +69,7 @@ class Config:
         Returns:
             str: 资源目录路径
         """
-        return os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "resources")
+        return _RESOURCES_PATH
     
     @staticmethod
     def get_templates_path() -> str:
@@ -71,7 +79,7 @@ class Config:
         Returns:
             str: 模板目录路径
         """
-        return os.path.join(Config.get_resources_path(), "templates")
+        return _TEMPLATES_PATH
     
     @staticmethod
     def get_icons_path() -> str:
@@ -81,7 +89,7 @@ class Config:
         Returns:
             str: 图标目录路径
         """
-        return os.path.join(Config.get_resources_path(), "icons")
+        return _ICONS_PATH
     
     @staticmethod
     def get_aws_patterns_path() -> str:
@@ -91,4 +99,4 @@ class Config:
         Returns:
             str: AWS模式目录路径
         """
-        return os.path.join(Config.get_resources_path(), "aws_patterns")
\ No newline at end of file
+        return _AWS_PATTERNS_PATH
\ No newline at end of file
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+磁盘缓存目录工具模块
+限制缓存目录的大小，按最近使用时间淘汰旧文件
+"""
+
+import os
+import stat
+
+from src.utils.logger import get_logger
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# 各缓存目录的上级目录，位于用户目录下，与日志目录相同
+_CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".architect_agent", "cache")
+
+
+def get_cache_dir(name: str) -> str:
+    """
+    获取当前用户的缓存目录路径，目录由ensure_cache_dir创建
+
+    Args:
+        name: 缓存目录名
+
+    Returns:
+        str: 缓存目录路径
+    """
+    return os.path.join(_CACHE_ROOT, name)
+
+
+def ensure_cache_dir(directory: str) -> bool:
+    """
+    创建仅当前用户可访问的缓存目录，并确认目录属于当前用户
+
+    Args:
+        directory: 缓存目录
+
+    Returns:
+        bool: 目录是否可以安全使用，不可用时调用方应跳过缓存
+    """
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        st = os.lstat(directory)
+        if not stat.S_ISDIR(st.st_mode):
+            logger.warning(f"缓存目录不是普通目录，跳过缓存: {directory}")
+            return False
+        if hasattr(os, "getuid") and st.st_uid != os.getuid():
+            logger.warning(f"缓存目录不属于当前用户，跳过缓存: {directory}")
+            return False
+        if stat.S_IMODE(st.st_mode) != 0o700:
+            os.chmod(directory, 0o700)
+        return True
+    except OSError as e:
+        logger.warning(f"创建缓存目录失败: {directory}, {str(e)}")
+        return False
+
+
+def touch_cache_file(path: str):
+    """
+    更新缓存文件的修改时间，标记为最近使用
+
+    Args:
+        path: 缓存文件路径
+    """
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_cache_dir(directory: str, suffix: str, max_entries: int, max_bytes: int):
+    """
+    淘汰缓存目录中最久未使用的文件，使文件数和总大小不超过上限
+
+    Args:
+        directory: 缓存目录
+        suffix: 缓存文件的扩展名，只处理这类文件
+        max_entries: 最多保留的文件数
+        max_bytes: 最多保留的总字节数
+    """
+    entries = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.name.endswith(suffix) and entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+    except OSError as e:
+        logger.warning(f"读取缓存目录失败: {directory}, {str(e)}")
+        return
+
+    # 从最近使用的文件开始保留，超出上限的文件删除
+    entries.sort(reverse=True)
+    total_bytes = 0
+    removed = 0
+    for index, (_, size, path) in enumerate(entries):
+        total_bytes += size
+        if index < max_entries and total_bytes <= max_bytes:
+            continue
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+
+    if removed:
+        logger.info(f"已清理缓存目录 {directory} 中的{removed}个文件")
\ No newline at end of file
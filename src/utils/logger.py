@@ -8,7 +8,10 @@
 
 import os
 import sys
+import queue
+import atexit
 import logging
+import logging.handlers
 import datetime
 from typing import Optional
 
@@ -34,6 +37,10 @@ class Logger:
         self.log_dir = os.path.join(os.path.expanduser("~"), ".architect_agent", "logs")
         os.makedirs(self.log_dir, exist_ok=True)
         
+        # 后台写日志的监听器及其处理器
+        self._listener = None
+        self._handlers = []
+        
         # 创建日志文件名
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         self.log_file = os.path.join(self.log_dir, f"app_{timestamp}.log")
@@ -64,6 +71,7 @@ class Logger:
         # 清除现有处理器
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
+        self._stop_listener()
         
         # 创建文件处理器
         file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
@@ -73,14 +81,28 @@ class Logger:
         formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
         file_handler.setFormatter(formatter)
         
-        # 添加文件处理器
-        root_logger.addHandler(file_handler)
-        
-        # 添加控制台处理器
+        # 创建控制台处理器
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(log_level)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        
+        # 记录日志时只放入队列，文件和控制台的写入在后台线程中进行，不阻塞界面和工作线程
+        log_queue = queue.Queue(-1)
+        root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._handlers = [file_handler, console_handler]
+        self._listener = logging.handlers.QueueListener(log_queue, *self._handlers, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self._stop_listener)
+    
+    def _stop_listener(self):
+        """停止后台写日志的监听器，写完队列中剩余的日志并关闭处理器"""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        self._listener = None
+        for handler in self._handlers:
+            handler.close()
+        self._handlers = []
     
     def set_level(self, level: str):
         """
@@ -91,7 +113,7 @@ class Logger:
         """
         log_level = getattr(logging, level.upper(), logging.INFO)
         self.logger.setLevel(log_level)
-        for handler in self.logger.handlers:
+        for handler in self.logger.handlers + self._handlers:
             handler.setLevel(log_level)
     
     def get_log_file(self) -> str:
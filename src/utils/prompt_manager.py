@@ -1,8 +1,39 @@
 # 修改src/utils/prompt_manager.py
 
 import os
+from pathlib import Path
 from typing import Dict, Any
 
+from src.utils.logger import get_logger
+
+# 获取日志记录器
+logger = get_logger(__name__)
+
+# 提示词目录，在导入时计算一次
+_PROMPTS_DIR = Path(__file__).resolve().parents[2] / "config" / "prompts"
+
+# 已读取的提示词文件：文件路径 -> (修改时间, 内容)
+_prompt_file_cache = {}
+
+def _read_prompt_file(file_path: str) -> str:
+    """
+    读取提示词文件，文件修改时间未变化时直接返回缓存的内容，修改后会重新读取
+    
+    Args:
+        file_path: 提示词文件路径
+        
+    Returns:
+        str: 提示词内容
+    """
+    mtime = os.stat(file_path).st_mtime_ns
+    cached = _prompt_file_cache.get(file_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    text = Path(file_path).read_text(encoding="utf-8")
+    _prompt_file_cache[file_path] = (mtime, text)
+    return text
+
 class PromptManager:
     """提示词管理器，负责加载和提供提示词模板"""
     
@@ -17,33 +48,30 @@ class PromptManager:
         return cls._instance
     
     def _load_prompts(self):
-        """加载提示词配置"""
+        """加载提示词配置，只记录提示词文件路径，文件内容在首次获取时才读取"""
         try:
-            # 获取项目根目录
-            root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            prompts_dir = os.path.join(root_dir, "config", "prompts")
+            prompts_dir = _PROMPTS_DIR
             
             self._prompts = {}
             
             if os.path.exists(prompts_dir):
-                # 遍历模型目录
-                for model_name in os.listdir(prompts_dir):
-                    model_dir = os.path.join(prompts_dir, model_name)
-                    if os.path.isdir(model_dir):
-                        self._prompts[model_name] = {}
+                # 遍历模型目录，scandir返回的目录项自带类型信息，无需再逐个stat
+                with os.scandir(prompts_dir) as model_entries:
+                    for model_entry in model_entries:
+                        if not model_entry.is_dir():
+                            continue
+                        prompts = self._prompts[model_entry.name] = {}
                         
                         # 遍历提示词文件
-                        for prompt_file in os.listdir(model_dir):
-                            if prompt_file.endswith(".md"):
-                                prompt_type = os.path.splitext(prompt_file)[0]
-                                file_path = os.path.join(model_dir, prompt_file)
-                                
-                                with open(file_path, "r", encoding="utf-8") as f:
-                                    self._prompts[model_name][prompt_type] = f.read()
+                        with os.scandir(model_entry.path) as prompt_entries:
+                            for prompt_entry in prompt_entries:
+                                if prompt_entry.name.endswith(".md") and prompt_entry.is_file():
+                                    prompt_type = os.path.splitext(prompt_entry.name)[0]
+                                    prompts[prompt_type] = prompt_entry.path
             else:
-                print(f"警告: 提示词目录不存在: {prompts_dir}")
+                logger.warning(f"提示词目录不存在: {prompts_dir}")
         except Exception as e:
-            print(f"加载提示词配置失败: {str(e)}")
+            logger.error(f"加载提示词配置失败: {str(e)}")
             self._prompts = {}
     
     def get_prompt(self, model_type: str, prompt_type: str, default: str = "") -> str:
@@ -58,4 +86,12 @@ class PromptManager:
         Returns:
             str: 提示词模板
         """
-        return self._prompts.get(model_type, {}).get(prompt_type, default)
+        file_path = self._prompts.get(model_type, {}).get(prompt_type)
+        if file_path is None:
+            return default
+        
+        try:
+            return _read_prompt_file(file_path)
+        except Exception as e:
+            logger.error(f"读取提示词文件失败: {file_path}, {str(e)}")
+            return default